@@ -0,0 +1,106 @@
+"""
+Monthly Pack Agent - Shared API Routes
+/api/batch, /api/search, /api/stats and the warm pool, registered once for both web interfaces
+"""
+
+from flask import jsonify, request
+from config import WARM_POOL_ENABLED, BATCH_MAX_COUNT, SEARCH_MAX_RESULTS
+from candidate_cache import CANDIDATE_CACHE
+from catalog import get_catalog
+from circuit_breaker import breaker_stats
+from pool_warmer import CandidateWarmer
+from profile_cache import load_user_data, get_profile_cache
+from providers import PROVIDERS, CATEGORIES, get_service, get_recommendations, fetch_batch
+
+def warm_fetch(category, count):
+    """Fetch used by the background warmer to top up a category's pool; never pools fallbacks"""
+    user_data = load_user_data()
+    return get_recommendations(category, user_data, count, live_only=True) if user_data else []
+
+def create_warmer():
+    """Pre-fetched candidates for every provider-backed category, so refresh clicks don't wait on providers"""
+    return CandidateWarmer(warm_fetch, [category for category, provider in PROVIDERS.items() if not provider.is_static])
+
+def get_pooled_recommendations(warmer, category, count=1, user_data=None):
+    """Serve from the warm pool when it has enough candidates, otherwise fetch live (one item when count is 1)"""
+    items = warmer.take(category, count)
+    if items:
+        return items if count > 1 else items[0]
+    user_data = user_data or load_user_data()
+    return get_recommendations(category, user_data, count) if user_data else None
+
+def register_api(app, warmer, page_cache):
+    """Add /api/batch, /api/search and /api/stats, served from `warmer` and reporting on `page_cache`"""
+    def batch():
+        """Resolve several categories in one round trip, e.g. /api/batch?categories=book,wine&count=3"""
+        requested = request.args.get('categories', '')
+        categories = [category.strip() for category in requested.split(',') if category.strip()] or CATEGORIES
+        count = max(1, min(request.args.get('count', 1, type=int), BATCH_MAX_COUNT))
+
+        user_data = load_user_data()
+        if not user_data:
+            return jsonify({'success': False, 'error': 'Failed to load user data'})
+
+        try:
+            results = fetch_batch(categories, user_data, count, take=warmer.take)
+            return jsonify({
+                'success': any(result['success'] for result in results.values()),
+                'count': count,
+                'results': results
+            })
+        except Exception as e:
+            print(f"❌ Error getting batch {requested}: {e}")
+            return jsonify({'success': False, 'error': str(e)})
+
+    def search():
+        """Full-text search over the local catalog, e.g. /api/search?q=ocean&category=book"""
+        query = request.args.get('q', '').strip()
+        category = request.args.get('category') or None
+        limit = max(1, min(request.args.get('limit', 20, type=int), SEARCH_MAX_RESULTS))
+        if not query:
+            return jsonify({'success': False, 'error': 'Missing search query'})
+        if category and category not in PROVIDERS:
+            return jsonify({'success': False, 'error': 'Invalid category'})
+
+        catalog = get_catalog()
+        if catalog is None:
+            return jsonify({'success': False, 'error': 'Catalog is disabled'})
+
+        try:
+            results = catalog.search(query, category, limit)
+            return jsonify({'success': True, 'query': query, 'count': len(results), 'results': results})
+        except Exception as e:
+            print(f"❌ Error searching catalog: {e}")
+            return jsonify({'success': False, 'error': 'Search failed'})
+
+    def stats():
+        """Cache counters, circuit breaker states and connection pool reuse"""
+        catalog = get_catalog()
+        return jsonify({
+            'candidate_cache': CANDIDATE_CACHE.stats(),
+            'catalog': catalog.stats() if catalog else None,
+            'circuit_breakers': breaker_stats(),
+            'connection_pool': get_service().pool_stats(),
+            'page_cache': page_cache.stats(),
+            'profile': get_profile_cache().stats(),
+            'warm_pool': warmer.stats()
+        })
+
+    app.add_url_rule('/api/batch', 'batch', batch)
+    app.add_url_rule('/api/search', 'search', search)
+    app.add_url_rule('/api/stats', 'stats', stats)
+    return app
+
+def preload_page(page_cache, render_chunks):
+    """Render the index page once before serve.py forks, so every worker starts with it cached"""
+    try:
+        page_cache.get('recommendations.json', lambda pack: ''.join(render_chunks(pack)))
+    except FileNotFoundError:
+        pass
+
+def start_background(warmer):
+    """Per-process start-up; threads don't survive a fork, so serve.py runs this in each worker"""
+    # Requests then read the profile from memory; the watcher picks up edits to user_data.json
+    get_profile_cache().start_watcher()
+    if WARM_POOL_ENABLED:
+        warmer.start()
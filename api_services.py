@@ -1,448 +1,651 @@
 import requests
 import json
 import random
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from config import *
+from http_cache import HTTPCache
+from candidate_cache import CANDIDATE_CACHE
+from circuit_breaker import BREAKERS, Deadline, ProviderUnavailable
+from catalog import get_catalog, catalog_lookup, catalog_store
+from dedup import item_key, get_history_index
+from providers import get_provider
+
+# Search terms based on user preferences
+BOOK_SEARCH_TERMS = ["memoir", "spiritual growth", "mindfulness", "cultural stories", "inspirational", "family stories", "personal growth"]
+PODCAST_SEARCH_TERMS = ["mindfulness", "parenting", "wellness", "meditation", "self growth", "yoga", "motherhood", "family"]
+
+# Fallback recommendations used when a provider is unavailable
+MOVIE_FALLBACKS = [
+    {
+        'title': 'The Good Place',
+        'description': 'A comedy-drama about ethics and personal growth',
+        'rating': 8.2,
+        'poster': '',
+        'type': 'tv'
+    },
+    {
+        'title': 'Bridgerton',
+        'description': 'Romantic period drama series with strong characters',
+        'rating': 7.3,
+        'poster': '',
+        'type': 'tv'
+    },
+    {
+        'title': 'Anne with an E',
+        'description': 'Coming-of-age story with heart and character development',
+        'rating': 8.7,
+        'poster': '',
+        'type': 'tv'
+    }
+]
+
+BOOK_FALLBACKS = [
+    {
+        'title': 'The Power of Now',
+        'author': 'Eckhart Tolle',
+        'description': 'A spiritual guide to enlightenment and living in the present moment',
+        'rating': 4.5,
+        'thumbnail': '',
+        'link': ''
+    },
+    {
+        'title': 'Untamed',
+        'author': 'Glennon Doyle',
+        'description': 'A memoir about finding courage to live authentically and break free from expectations',
+        'rating': 4.3,
+        'thumbnail': '',
+        'link': ''
+    },
+    {
+        'title': 'The Gifts of Imperfection',
+        'author': 'Brené Brown',
+        'description': 'Guide to cultivating courage, compassion, and connection',
+        'rating': 4.6,
+        'thumbnail': '',
+        'link': ''
+    }
+]
+
+PODCAST_FALLBACKS = [
+    {
+        'title': 'The Mindful Mom',
+        'creator': 'Various',
+        'description': 'A podcast for mindful parenting and personal growth',
+        'artwork': '',
+        'link': ''
+    },
+    {
+        'title': 'Meditation for Moms',
+        'creator': 'Various',
+        'description': 'Guided meditations and mindfulness practices for busy mothers',
+        'artwork': '',
+        'link': ''
+    },
+    {
+        'title': 'Wellness for Women',
+        'creator': 'Various',
+        'description': 'Health, wellness, and self-care tips for women',
+        'artwork': '',
+        'link': ''
+    }
+]
+
+# Since no free wine API, use curated list based on preferences
+RED_WINES = [
+    {
+        'name': 'Catena Malbec',
+        'type': 'Malbec',
+        'region': 'Argentina',
+        'price_range': '$15-25',
+        'description': 'Rich, full-bodied Malbec with dark fruit flavors and smooth tannins',
+        'where_to_buy': 'Total Wine, BevMo'
+    },
+    {
+        'name': 'Bogle Cabernet Sauvignon',
+        'type': 'Cabernet Sauvignon', 
+        'region': 'California',
+        'price_range': '$12-18',
+        'description': 'Classic California Cabernet with blackberry and vanilla notes',
+        'where_to_buy': 'Safeway, Total Wine'
+    },
+    {
+        'name': 'Columbia Crest Grand Estates Syrah',
+        'type': 'Syrah',
+        'region': 'Washington',
+        'price_range': '$10-15',
+        'description': 'Bold Syrah with spice and dark berry flavors',
+        'where_to_buy': 'Most grocery stores'
+    },
+    {
+        'name': 'Seghesio Zinfandel',
+        'type': 'Zinfandel',
+        'region': 'Sonoma County',
+        'price_range': '$20-30',
+        'description': 'Robust Zinfandel with jammy fruit and peppery finish',
+        'where_to_buy': 'Wine shops, Total Wine'
+    },
+    {
+        'name': 'Decoy Cabernet Sauvignon',
+        'type': 'Cabernet Sauvignon',
+        'region': 'Sonoma County',
+        'price_range': '$18-25',
+        'description': 'Elegant Cabernet with cherry and plum notes, smooth finish',
+        'where_to_buy': 'BevMo, Whole Foods'
+    },
+    {
+        'name': 'Alamos Malbec',
+        'type': 'Malbec',
+        'region': 'Argentina',
+        'price_range': '$8-12',
+        'description': 'Affordable everyday Malbec with ripe berry flavors',
+        'where_to_buy': 'Most grocery stores'
+    },
+    {
+        'name': 'La Crema Pinot Noir',
+        'type': 'Pinot Noir',
+        'region': 'Sonoma Coast',
+        'price_range': '$25-35',
+        'description': 'Sophisticated Pinot Noir with cherry and earth tones',
+        'where_to_buy': 'Wine shops, Total Wine'
+    }
+]
+
+# Curated list of Bay Area hikes matching preferences
+BAY_AREA_HIKES = [
+    {
+        'name': 'Filoli Gardens Trail',
+        'location': 'Woodside, CA',
+        'distance': '2 miles',
+        'elevation': '100 ft',
+        'difficulty': 'Easy',
+        'features': ['Gardens', 'Historic mansion', 'Peaceful'],
+        'description': 'Beautiful gardens and easy walking paths with stunning views'
+    },
+    {
+        'name': 'Uvas Canyon County Park',
+        'location': 'Morgan Hill, CA',
+        'distance': '4 miles',
+        'elevation': '300 ft',
+        'difficulty': 'Moderate',
+        'features': ['Waterfalls', 'Creek', 'Shaded'],
+        'description': 'Lovely trail with multiple waterfalls and creek crossings'
+    },
+    {
+        'name': 'Rancho San Antonio Preserve',
+        'location': 'Cupertino, CA',
+        'distance': '6 miles',
+        'elevation': '200 ft',
+        'difficulty': 'Moderate',
+        'features': ['Close to home', 'Wildlife', 'Open space'],
+        'description': 'Local favorite with rolling hills and farm animals'
+    },
+    {
+        'name': 'Pescadero Creek Park',
+        'location': 'Pescadero, CA',
+        'distance': '5 miles',
+        'elevation': '250 ft',
+        'difficulty': 'Moderate',
+        'features': ['Redwoods', 'Creek', 'Peaceful'],
+        'description': 'Serene hike through towering redwoods along a gentle creek'
+    },
+    {
+        'name': 'Stevens Creek County Park',
+        'location': 'Cupertino, CA',
+        'distance': '3 miles',
+        'elevation': '150 ft',
+        'difficulty': 'Easy-Moderate',
+        'features': ['Close to home', 'Lake views', 'Shaded'],
+        'description': 'Pleasant loop around Stevens Creek Reservoir'
+    },
+    {
+        'name': 'Castle Rock State Park',
+        'location': 'Los Gatos, CA',
+        'distance': '5 miles',
+        'elevation': '400 ft',
+        'difficulty': 'Moderate',
+        'features': ['Rock formations', 'Views', 'Forest'],
+        'description': 'Stunning rock formations and panoramic views'
+    },
+    {
+        'name': 'Almaden Quicksilver Park',
+        'location': 'San Jose, CA',
+        'distance': '4 miles',
+        'elevation': '300 ft',
+        'difficulty': 'Moderate',
+        'features': ['Historic mining', 'Wildflowers', 'Open hills'],
+        'description': 'Historic mining area with beautiful spring wildflowers'
+    }
+]
+
+# Curated list based on Jo Malone preferences and scent profile
+PERFUMES = [
+    {
+        'name': 'Jo Malone Wood Sage & Sea Salt',
+        'brand': 'Jo Malone',
+        'scent_family': ['Woody', 'Fresh'],
+        'price_range': '$68-134',
+        'description': 'Fresh and woody with sea salt minerality - perfect for everyday wear',
+        'where_to_buy': 'Sephora, Nordstrom'
+    },
+    {
+        'name': 'Bath & Body Works Eucalyptus Tea',
+        'brand': 'Bath & Body Works',
+        'scent_family': ['Woody', 'Herbal'],
+        'price_range': '$12-25',
+        'description': 'Affordable alternative with eucalyptus and warm tea notes',
+        'where_to_buy': 'Bath & Body Works'
+    },
+    {
+        'name': 'The Body Shop White Musk',
+        'brand': 'The Body Shop',
+        'scent_family': ['Woody', 'Floral'],
+        'price_range': '$20-35',
+        'description': 'Clean, warm musk with subtle floral undertones',
+        'where_to_buy': 'The Body Shop, Ulta'
+    },
+    {
+        'name': 'Jo Malone Basil & Neroli',
+        'brand': 'Jo Malone',
+        'scent_family': ['Herbal', 'Citrus'],
+        'price_range': '$68-134',
+        'description': 'Uplifting blend of basil and neroli - energizing and sophisticated',
+        'where_to_buy': 'Sephora, Jo Malone boutique'
+    },
+    {
+        'name': 'Pacifica Indian Coconut Nectar',
+        'brand': 'Pacifica',
+        'scent_family': ['Warm', 'Exotic'],
+        'price_range': '$22-36',
+        'description': 'Warm coconut with vanilla and wood notes - tropical and cozy',
+        'where_to_buy': 'Target, Ulta, Whole Foods'
+    },
+    {
+        'name': 'Jo Malone Peony & Blush Suede',
+        'brand': 'Jo Malone',
+        'scent_family': ['Floral', 'Suede'],
+        'price_range': '$68-134',
+        'description': 'Soft floral with luxurious suede notes - elegant and feminine',
+        'where_to_buy': 'Sephora, Nordstrom'
+    },
+    {
+        'name': 'Nest Cedar Leaf & Lavender',
+        'brand': 'Nest',
+        'scent_family': ['Woody', 'Herbal'],
+        'price_range': '$45-68',
+        'description': 'Calming blend of cedar and lavender - perfect for relaxation',
+        'where_to_buy': 'Sephora, Nordstrom'
+    }
+]
+
+# Request builders and response parsers shared by the sync and async services,
+# so both return exactly the same normalized item dicts.
+
+def trending_request():
+    """URL and params for the TMDB weekly trending feed"""
+    return f"{TMDB_BASE_URL}/trending/all/week", {'api_key': TMDB_API_KEY}
+
+def book_search_request(search_query):
+    """URL and params for a Google Books volume search"""
+    params = {
+        'q': search_query,
+        'key': GOOGLE_BOOKS_API_KEY,
+        'maxResults': 15,
+        'orderBy': 'relevance'
+    }
+    return f"{GOOGLE_BOOKS_BASE_URL}/volumes", params
+
+def podcast_search_request(search_term):
+    """URL and params for an iTunes podcast search"""
+    params = {
+        'term': search_term,
+        'media': 'podcast',
+        'limit': 15
+    }
+    return ITUNES_BASE_URL, params
+
+def parse_trending(data):
+    """Turn a TMDB trending payload into drama/comedy/romance items, best rated first"""
+    movies = []
+    tv_shows = []
+    results = data.get('results', [])
+    for item in results[:40]:  # Check more items for variety
+        if item.get('media_type') == 'movie':
+            # Filter for drama, comedy, romance
+            genres = item.get('genre_ids', [])
+            if any(g in [18, 35, 10749] for g in genres):  # Drama, Comedy, Romance
+                movies.append({
+                    'title': item.get('title', ''),
+                    'description': item.get('overview', ''),
+                    'rating': item.get('vote_average', 0),
+                    'poster': f"https://image.tmdb.org/t/p/w500{item.get('poster_path', '')}" if item.get('poster_path') else '',
+                    'type': 'movie'
+                })
+        elif item.get('media_type') == 'tv':
+            genres = item.get('genre_ids', [])
+            if any(g in [18, 35, 10749] for g in genres):
+                tv_shows.append({
+                    'title': item.get('name', ''),
+                    'description': item.get('overview', ''),
+                    'rating': item.get('vote_average', 0),
+                    'poster': f"https://image.tmdb.org/t/p/w500{item.get('poster_path', '')}" if item.get('poster_path') else '',
+                    'type': 'tv'
+                })
+    
+    # Sort by rating so the top choices come first
+    all_content = movies + tv_shows
+    all_content.sort(key=lambda x: x['rating'], reverse=True)
+    return all_content
+
+def parse_books(data):
+    """Turn a Google Books payload into book items"""
+    books_found = []
+    for book in data.get('items', []):
+        volume_info = book.get('volumeInfo', {})
+        if volume_info.get('authors') and volume_info.get('description'):
+            books_found.append({
+                'title': volume_info.get('title', ''),
+                'author': ', '.join(volume_info.get('authors', [])),
+                'description': volume_info.get('description', '')[:200] + '...',
+                'rating': volume_info.get('averageRating', 'N/A'),
+                'thumbnail': volume_info.get('imageLinks', {}).get('thumbnail', ''),
+                'link': volume_info.get('previewLink', '')
+            })
+    return books_found
+
+def parse_podcasts(data, search_term):
+    """Turn an iTunes search payload into podcast items"""
+    podcasts_found = []
+    for podcast in data.get('results', []):
+        if podcast.get('artistName') and podcast.get('collectionName'):
+            podcasts_found.append({
+                'title': podcast.get('collectionName', ''),
+                'creator': podcast.get('artistName', ''),
+                'description': podcast.get('description', '')[:200] + '...' if podcast.get('description') else 'Podcast focused on ' + search_term,
+                'artwork': podcast.get('artworkUrl600', ''),
+                'link': podcast.get('collectionViewUrl', '')
+            })
+    return podcasts_found
+
+def unique_by_title(items):
+    """Remove duplicate titles (compared normalized), keeping the first occurrence"""
+    unique_items = []
+    seen_titles = set()
+    for item in items:
+        key = item_key(item)
+        if key not in seen_titles:
+            unique_items.append(item)
+            seen_titles.add(key)
+    return unique_items
+
+def pick(items, count):
+    """Return the first `count` items, or a single item when count is 1"""
+    return items[:count] if count > 1 else items[0]
+
+def pick_random(items, count):
+    """Return random choices from a curated list without duplicates"""
+    if count == 1:
+        return random.choice(items)
+    else:
+        # Return multiple random choices without duplicates
+        shuffled = items.copy()
+        random.shuffle(shuffled)
+        return shuffled[:min(count, len(shuffled))]
+
+def default_cache():
+    """The on-disk response cache, or None when disabled in config"""
+    return HTTPCache() if HTTP_CACHE_ENABLED else None
+
+def create_session():
+    """requests.Session with a sized keep-alive pool and a small retry policy"""
+    # read=0: a read timeout already spent the call's read budget, so retrying it would overrun the deadline
+    retries = Retry(
+        total=HTTP_RETRIES,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=['GET'],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retries)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 class RecommendationService:
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, max_concurrency=None, cache=None, candidates=None, catalog=None, history=None):
+        # One session per service; share a service across threads to reuse connections
+        self.session = create_session()
+        self.max_concurrency = max_concurrency or SEARCH_CONCURRENCY
+        self.cache = cache if cache is not None else default_cache()
+        self.candidates = candidates if candidates is not None else CANDIDATE_CACHE
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self.history = history if history is not None else get_history_index()
+        # Long-lived workers for uncached search terms and deadline-bounded fetches, sized like the connection pool
+        self.executor = ThreadPoolExecutor(max_workers=max(self.max_concurrency, HTTP_POOL_MAXSIZE),
+                                           thread_name_prefix='provider-fetch')
     
-    def get_movie_recommendations(self, user_prefs, count=1):
-        """Get movie/TV recommendations from TMDB"""
+    def pool_stats(self):
+        """Per-host connection pool counters, showing how often connections are reused"""
+        stats = {}
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                    'connections_opened': pool.num_connections,
+                    'requests': pool.num_requests,
+                    'reused': max(0, pool.num_requests - pool.num_connections),
+                    'idle': pool.pool.qsize() if pool.pool else 0,
+                    'maxsize': pool.pool.maxsize if pool.pool else 0
+                }
+        return stats
+    
+    def _get_json(self, provider, url, params, ttl=0, deadline=None):
+        """GET a provider endpoint and return its JSON body, or None on a non-200 response.
+        
+        Responses are served from the disk cache for `ttl` seconds; after that a
+        stale entry is revalidated with ETag/Last-Modified when the upstream sent them.
+        Upstream calls are bounded by the provider timeouts and the call's deadline,
+        and go through the provider's circuit breaker.
+        """
+        entry = self.cache.get(url, params) if self.cache and ttl else None
+        if entry and self.cache.is_fresh(entry, ttl):
+            return entry['body']
+        
+        headers = self.cache.revalidation_headers(entry) if entry else {}
+        timeout = (deadline or Deadline()).timeout(provider)
+        breaker = BREAKERS[provider]
+        breaker.before_call()
         try:
-            # Search for shows similar to user's favorites
-            favorite_shows = ["Virgin River", "Emily in Paris", "The Crown", "Fauda"]
+            response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+            return None
+        breaker.record_success()
+        
+        if response.status_code == 304 and entry:
+            self.cache.refresh(url, params, entry)
+            return entry['body']
+        if response.status_code == 200:
+            data = response.json()
+            if self.cache and ttl:
+                self.cache.store(url, params, data, response.headers)
+            return data
+        return None
+    
+    def _cached_candidates(self, key, load, ttl):
+        """Normalized candidates for a (provider, query) key, from memory or the catalog when possible"""
+        def load_through_catalog():
+            # A ttl of 0 turns caching off, catalog-first answers included
+            items = catalog_lookup(self.catalog, key, ttl) if self.catalog and CATALOG_FIRST and ttl != 0 else []
+            if not items:
+                items = load()
+                if items and self.catalog:
+                    catalog_store(self.catalog, key, items)
+            return items
+        
+        if not self.candidates:
+            return load_through_catalog()
+        return self.candidates.get_or_load(key, load_through_catalog, ttl)
+    
+    def _unseen(self, category, items, count):
+        """Candidates not recommended in a past pack, falling back to repeats when needed"""
+        return self.history.prefer_unseen(category, items, count) if self.history else items
+    
+    def _fetch_all_terms(self, fetch_term, search_terms, deadline, cache_key=None):
+        """Run fetch_term for every search term, returning results in term order.
+        
+        Terms whose candidates are already in memory (looked up by cache_key(term))
+        are answered inline; only the misses go to the service's workers, at most
+        max_concurrency at a time. A term that fails or misses the deadline
+        contributes an empty list.
+        """
+        results = {}
+        if cache_key and self.candidates:
+            for term in search_terms:
+                items = self.candidates.get(cache_key(term), count_miss=False)
+                if items is not None:
+                    results[term] = items
+        misses = [term for term in dict.fromkeys(search_terms) if term not in results]
+        
+        if self.max_concurrency <= 1:
+            for term in misses:
+                try:
+                    deadline.remaining()
+                    results[term] = fetch_term(term)
+                except Exception as e:
+                    print(f"Error fetching '{term}': {e or type(e).__name__}")
+                    results[term] = []
+        elif misses:
+            limit = threading.Semaphore(self.max_concurrency)
             
-            movies = []
-            tv_shows = []
+            def bounded(term):
+                with limit:
+                    return fetch_term(term)
             
-            # Get trending content
-            trending_url = f"{TMDB_BASE_URL}/trending/all/week?api_key={TMDB_API_KEY}"
-            response = self.session.get(trending_url)
+            futures = [(term, self.executor.submit(bounded, term)) for term in misses]
+            try:
+                for term, future in futures:
+                    try:
+                        results[term] = future.result(timeout=deadline.remaining())
+                    except Exception as e:
+                        print(f"Error fetching '{term}': {e or type(e).__name__}")
+                        results[term] = []
+            finally:
+                # Don't wait for stragglers; their own socket timeouts will end them
+                for _, future in futures:
+                    future.cancel()
+        return [results[term] for term in search_terms]
+    
+    def _within_deadline(self, load, deadline):
+        """Run load() on a worker and stop waiting once the deadline runs out, like _fetch_all_terms does per term"""
+        future = self.executor.submit(load)
+        try:
+            return future.result(timeout=deadline.remaining())
+        finally:
+            future.cancel()
+    
+    def get_movie_recommendations(self, user_prefs, count=1, live_only=False):
+        """Get movie/TV recommendations from TMDB"""
+        try:
+            deadline = Deadline()
+            ttl = get_provider('entertainment').cache_ttl()
             
-            if response.status_code == 200:
-                results = response.json().get('results', [])
-                for item in results[:40]:  # Check more items for variety
-                    if item.get('media_type') == 'movie':
-                        # Filter for drama, comedy, romance
-                        genres = item.get('genre_ids', [])
-                        if any(g in [18, 35, 10749] for g in genres):  # Drama, Comedy, Romance
-                            movies.append({
-                                'title': item.get('title', ''),
-                                'description': item.get('overview', ''),
-                                'rating': item.get('vote_average', 0),
-                                'poster': f"https://image.tmdb.org/t/p/w500{item.get('poster_path', '')}" if item.get('poster_path') else '',
-                                'type': 'movie'
-                            })
-                    elif item.get('media_type') == 'tv':
-                        genres = item.get('genre_ids', [])
-                        if any(g in [18, 35, 10749] for g in genres):
-                            tv_shows.append({
-                                'title': item.get('name', ''),
-                                'description': item.get('overview', ''),
-                                'rating': item.get('vote_average', 0),
-                                'poster': f"https://image.tmdb.org/t/p/w500{item.get('poster_path', '')}" if item.get('poster_path') else '',
-                                'type': 'tv'
-                            })
+            # Get trending content (normalized list is cached per process)
+            def fetch_trending():
+                data = self._get_json('tmdb', *trending_request(), ttl=ttl, deadline=deadline)
+                return parse_trending(data) if data else []
             
-            # Return multiple recommendations
-            all_content = movies + tv_shows
+            # Return multiple recommendations; a status retry could otherwise outlast the deadline
+            all_content = self._cached_candidates(('tmdb', 'trending'),
+                                                  lambda: self._within_deadline(fetch_trending, deadline), ttl)
             if all_content:
-                # Sort by rating and return top choices
-                all_content.sort(key=lambda x: x['rating'], reverse=True)
-                return all_content[:count] if count > 1 else all_content[0]
+                return pick(self._unseen('entertainment', all_content, count), count)
             
         except Exception as e:
             print(f"Error fetching movies/TV: {e}")
         
-        # Fallback recommendations
-        fallbacks = [
-            {
-                'title': 'The Good Place',
-                'description': 'A comedy-drama about ethics and personal growth',
-                'rating': 8.2,
-                'poster': '',
-                'type': 'tv'
-            },
-            {
-                'title': 'Bridgerton',
-                'description': 'Romantic period drama series with strong characters',
-                'rating': 7.3,
-                'poster': '',
-                'type': 'tv'
-            },
-            {
-                'title': 'Anne with an E',
-                'description': 'Coming-of-age story with heart and character development',
-                'rating': 8.7,
-                'poster': '',
-                'type': 'tv'
-            }
-        ]
-        return fallbacks[:count] if count > 1 else fallbacks[0]
+        if live_only:
+            raise ProviderUnavailable("TMDB gave no results")
+        return pick(self._unseen('entertainment', MOVIE_FALLBACKS, count), count)
     
-    def get_book_recommendations(self, user_prefs, count=1):
+    def get_book_recommendations(self, user_prefs, count=1, live_only=False):
         """Get book recommendations from Google Books"""
         try:
-            # Search terms based on user preferences
-            search_terms = ["memoir", "spiritual growth", "mindfulness", "cultural stories", "inspirational", "family stories", "personal growth"]
+            deadline = Deadline()
+            ttl = get_provider('book').cache_ttl()
             
-            all_books = []
+            def fetch_books(search_query):
+                def load():
+                    data = self._get_json('books', *book_search_request(search_query), ttl=ttl, deadline=deadline)
+                    return parse_books(data) if data else []
+                return self._cached_candidates(('books', search_query), load, ttl)
             
-            # Try multiple search terms for variety
-            for search_query in search_terms[:3]:  # Use first 3 terms
-                url = f"{GOOGLE_BOOKS_BASE_URL}/volumes"
-                params = {
-                    'q': search_query,
-                    'key': GOOGLE_BOOKS_API_KEY,
-                    'maxResults': 15,
-                    'orderBy': 'relevance'
-                }
-                
-                response = self.session.get(url, params=params)
-                
-                if response.status_code == 200:
-                    books = response.json().get('items', [])
-                    for book in books:
-                        volume_info = book.get('volumeInfo', {})
-                        if volume_info.get('authors') and volume_info.get('description'):
-                            all_books.append({
-                                'title': volume_info.get('title', ''),
-                                'author': ', '.join(volume_info.get('authors', [])),
-                                'description': volume_info.get('description', '')[:200] + '...',
-                                'rating': volume_info.get('averageRating', 'N/A'),
-                                'thumbnail': volume_info.get('imageLinks', {}).get('thumbnail', ''),
-                                'link': volume_info.get('previewLink', '')
-                            })
+            # Try multiple search terms for variety (first 3 terms, fetched concurrently)
+            all_books = []
+            for books_found in self._fetch_all_terms(fetch_books, BOOK_SEARCH_TERMS[:3], deadline,
+                                                   cache_key=lambda term: ('books', term)):
+                all_books.extend(books_found)
             
             if all_books:
                 # Remove duplicates and return requested count
-                unique_books = []
-                seen_titles = set()
-                for book in all_books:
-                    if book['title'].lower() not in seen_titles:
-                        unique_books.append(book)
-                        seen_titles.add(book['title'].lower())
-                
-                return unique_books[:count] if count > 1 else unique_books[0]
+                return pick(self._unseen('book', unique_by_title(all_books), count), count)
                         
         except Exception as e:
             print(f"Error fetching books: {e}")
         
-        # Fallback recommendations
-        fallbacks = [
-            {
-                'title': 'The Power of Now',
-                'author': 'Eckhart Tolle',
-                'description': 'A spiritual guide to enlightenment and living in the present moment',
-                'rating': 4.5,
-                'thumbnail': '',
-                'link': ''
-            },
-            {
-                'title': 'Untamed',
-                'author': 'Glennon Doyle',
-                'description': 'A memoir about finding courage to live authentically and break free from expectations',
-                'rating': 4.3,
-                'thumbnail': '',
-                'link': ''
-            },
-            {
-                'title': 'The Gifts of Imperfection',
-                'author': 'Brené Brown',
-                'description': 'Guide to cultivating courage, compassion, and connection',
-                'rating': 4.6,
-                'thumbnail': '',
-                'link': ''
-            }
-        ]
-        return fallbacks[:count] if count > 1 else fallbacks[0]
+        if live_only:
+            raise ProviderUnavailable("Google Books gave no results")
+        return pick(self._unseen('book', BOOK_FALLBACKS, count), count)
     
-    def get_podcast_recommendations(self, user_prefs, count=1):
+    def get_podcast_recommendations(self, user_prefs, count=1, live_only=False):
         """Get podcast recommendations from iTunes"""
         try:
-            # Search terms based on user preferences
-            search_terms = ["mindfulness", "parenting", "wellness", "meditation", "self growth", "yoga", "motherhood", "family"]
+            deadline = Deadline()
+            ttl = get_provider('podcast').cache_ttl()
             
-            all_podcasts = []
+            def fetch_podcasts(search_term):
+                def load():
+                    data = self._get_json('itunes', *podcast_search_request(search_term), ttl=ttl, deadline=deadline)
+                    return parse_podcasts(data, search_term) if data else []
+                return self._cached_candidates(('itunes', search_term), load, ttl)
             
-            # Try multiple search terms for variety
-            for search_term in search_terms[:4]:  # Use first 4 terms
-                url = ITUNES_BASE_URL
-                params = {
-                    'term': search_term,
-                    'media': 'podcast',
-                    'limit': 15
-                }
-                
-                response = self.session.get(url, params=params)
-                
-                if response.status_code == 200:
-                    podcasts = response.json().get('results', [])
-                    for podcast in podcasts:
-                        if podcast.get('artistName') and podcast.get('collectionName'):
-                            all_podcasts.append({
-                                'title': podcast.get('collectionName', ''),
-                                'creator': podcast.get('artistName', ''),
-                                'description': podcast.get('description', '')[:200] + '...' if podcast.get('description') else 'Podcast focused on ' + search_term,
-                                'artwork': podcast.get('artworkUrl600', ''),
-                                'link': podcast.get('collectionViewUrl', '')
-                            })
+            # Try multiple search terms for variety (first 4 terms, fetched concurrently)
+            all_podcasts = []
+            for podcasts_found in self._fetch_all_terms(fetch_podcasts, PODCAST_SEARCH_TERMS[:4], deadline,
+                                                      cache_key=lambda term: ('itunes', term)):
+                all_podcasts.extend(podcasts_found)
             
             if all_podcasts:
                 # Remove duplicates and return requested count
-                unique_podcasts = []
-                seen_titles = set()
-                for podcast in all_podcasts:
-                    if podcast['title'].lower() not in seen_titles:
-                        unique_podcasts.append(podcast)
-                        seen_titles.add(podcast['title'].lower())
-                
-                return unique_podcasts[:count] if count > 1 else unique_podcasts[0]
+                return pick(self._unseen('podcast', unique_by_title(all_podcasts), count), count)
                         
         except Exception as e:
             print(f"Error fetching podcasts: {e}")
         
-        # Fallback recommendations
-        fallbacks = [
-            {
-                'title': 'The Mindful Mom',
-                'creator': 'Various',
-                'description': 'A podcast for mindful parenting and personal growth',
-                'artwork': '',
-                'link': ''
-            },
-            {
-                'title': 'Meditation for Moms',
-                'creator': 'Various',
-                'description': 'Guided meditations and mindfulness practices for busy mothers',
-                'artwork': '',
-                'link': ''
-            },
-            {
-                'title': 'Wellness for Women',
-                'creator': 'Various',
-                'description': 'Health, wellness, and self-care tips for women',
-                'artwork': '',
-                'link': ''
-            }
-        ]
-        return fallbacks[:count] if count > 1 else fallbacks[0]
+        if live_only:
+            raise ProviderUnavailable("iTunes gave no results")
+        return pick(self._unseen('podcast', PODCAST_FALLBACKS, count), count)
     
     def get_wine_recommendations(self, user_prefs, count=1):
         """Get wine recommendations - manual curated list"""
-        # Since no free wine API, use curated list based on preferences
-        red_wines = [
-            {
-                'name': 'Catena Malbec',
-                'type': 'Malbec',
-                'region': 'Argentina',
-                'price_range': '$15-25',
-                'description': 'Rich, full-bodied Malbec with dark fruit flavors and smooth tannins',
-                'where_to_buy': 'Total Wine, BevMo'
-            },
-            {
-                'name': 'Bogle Cabernet Sauvignon',
-                'type': 'Cabernet Sauvignon', 
-                'region': 'California',
-                'price_range': '$12-18',
-                'description': 'Classic California Cabernet with blackberry and vanilla notes',
-                'where_to_buy': 'Safeway, Total Wine'
-            },
-            {
-                'name': 'Columbia Crest Grand Estates Syrah',
-                'type': 'Syrah',
-                'region': 'Washington',
-                'price_range': '$10-15',
-                'description': 'Bold Syrah with spice and dark berry flavors',
-                'where_to_buy': 'Most grocery stores'
-            },
-            {
-                'name': 'Seghesio Zinfandel',
-                'type': 'Zinfandel',
-                'region': 'Sonoma County',
-                'price_range': '$20-30',
-                'description': 'Robust Zinfandel with jammy fruit and peppery finish',
-                'where_to_buy': 'Wine shops, Total Wine'
-            },
-            {
-                'name': 'Decoy Cabernet Sauvignon',
-                'type': 'Cabernet Sauvignon',
-                'region': 'Sonoma County',
-                'price_range': '$18-25',
-                'description': 'Elegant Cabernet with cherry and plum notes, smooth finish',
-                'where_to_buy': 'BevMo, Whole Foods'
-            },
-            {
-                'name': 'Alamos Malbec',
-                'type': 'Malbec',
-                'region': 'Argentina',
-                'price_range': '$8-12',
-                'description': 'Affordable everyday Malbec with ripe berry flavors',
-                'where_to_buy': 'Most grocery stores'
-            },
-            {
-                'name': 'La Crema Pinot Noir',
-                'type': 'Pinot Noir',
-                'region': 'Sonoma Coast',
-                'price_range': '$25-35',
-                'description': 'Sophisticated Pinot Noir with cherry and earth tones',
-                'where_to_buy': 'Wine shops, Total Wine'
-            }
-        ]
-        
-        if count == 1:
-            return random.choice(red_wines)
-        else:
-            # Return multiple random choices without duplicates
-            shuffled = red_wines.copy()
-            random.shuffle(shuffled)
-            return shuffled[:min(count, len(shuffled))]
+        return pick_random(self._unseen('wine', RED_WINES, count), count)
     
     def get_hiking_recommendations(self, user_prefs, count=1):
         """Get hiking recommendations for Bay Area"""
-        # Curated list of Bay Area hikes matching preferences
-        bay_area_hikes = [
-            {
-                'name': 'Filoli Gardens Trail',
-                'location': 'Woodside, CA',
-                'distance': '2 miles',
-                'elevation': '100 ft',
-                'difficulty': 'Easy',
-                'features': ['Gardens', 'Historic mansion', 'Peaceful'],
-                'description': 'Beautiful gardens and easy walking paths with stunning views'
-            },
-            {
-                'name': 'Uvas Canyon County Park',
-                'location': 'Morgan Hill, CA',
-                'distance': '4 miles',
-                'elevation': '300 ft',
-                'difficulty': 'Moderate',
-                'features': ['Waterfalls', 'Creek', 'Shaded'],
-                'description': 'Lovely trail with multiple waterfalls and creek crossings'
-            },
-            {
-                'name': 'Rancho San Antonio Preserve',
-                'location': 'Cupertino, CA',
-                'distance': '6 miles',
-                'elevation': '200 ft',
-                'difficulty': 'Moderate',
-                'features': ['Close to home', 'Wildlife', 'Open space'],
-                'description': 'Local favorite with rolling hills and farm animals'
-            },
-            {
-                'name': 'Pescadero Creek Park',
-                'location': 'Pescadero, CA',
-                'distance': '5 miles',
-                'elevation': '250 ft',
-                'difficulty': 'Moderate',
-                'features': ['Redwoods', 'Creek', 'Peaceful'],
-                'description': 'Serene hike through towering redwoods along a gentle creek'
-            },
-            {
-                'name': 'Stevens Creek County Park',
-                'location': 'Cupertino, CA',
-                'distance': '3 miles',
-                'elevation': '150 ft',
-                'difficulty': 'Easy-Moderate',
-                'features': ['Close to home', 'Lake views', 'Shaded'],
-                'description': 'Pleasant loop around Stevens Creek Reservoir'
-            },
-            {
-                'name': 'Castle Rock State Park',
-                'location': 'Los Gatos, CA',
-                'distance': '5 miles',
-                'elevation': '400 ft',
-                'difficulty': 'Moderate',
-                'features': ['Rock formations', 'Views', 'Forest'],
-                'description': 'Stunning rock formations and panoramic views'
-            },
-            {
-                'name': 'Almaden Quicksilver Park',
-                'location': 'San Jose, CA',
-                'distance': '4 miles',
-                'elevation': '300 ft',
-                'difficulty': 'Moderate',
-                'features': ['Historic mining', 'Wildflowers', 'Open hills'],
-                'description': 'Historic mining area with beautiful spring wildflowers'
-            }
-        ]
-        
-        if count == 1:
-            return random.choice(bay_area_hikes)
-        else:
-            # Return multiple random choices without duplicates
-            shuffled = bay_area_hikes.copy()
-            random.shuffle(shuffled)
-            return shuffled[:min(count, len(shuffled))]
+        return pick_random(self._unseen('hiking', BAY_AREA_HIKES, count), count)
     
     def get_perfume_recommendations(self, user_prefs, count=1):
         """Get perfume recommendations - curated list"""
-        # Curated list based on Jo Malone preferences and scent profile
-        perfumes = [
-            {
-                'name': 'Jo Malone Wood Sage & Sea Salt',
-                'brand': 'Jo Malone',
-                'scent_family': ['Woody', 'Fresh'],
-                'price_range': '$68-134',
-                'description': 'Fresh and woody with sea salt minerality - perfect for everyday wear',
-                'where_to_buy': 'Sephora, Nordstrom'
-            },
-            {
-                'name': 'Bath & Body Works Eucalyptus Tea',
-                'brand': 'Bath & Body Works',
-                'scent_family': ['Woody', 'Herbal'],
-                'price_range': '$12-25',
-                'description': 'Affordable alternative with eucalyptus and warm tea notes',
-                'where_to_buy': 'Bath & Body Works'
-            },
-            {
-                'name': 'The Body Shop White Musk',
-                'brand': 'The Body Shop',
-                'scent_family': ['Woody', 'Floral'],
-                'price_range': '$20-35',
-                'description': 'Clean, warm musk with subtle floral undertones',
-                'where_to_buy': 'The Body Shop, Ulta'
-            },
-            {
-                'name': 'Jo Malone Basil & Neroli',
-                'brand': 'Jo Malone',
-                'scent_family': ['Herbal', 'Citrus'],
-                'price_range': '$68-134',
-                'description': 'Uplifting blend of basil and neroli - energizing and sophisticated',
-                'where_to_buy': 'Sephora, Jo Malone boutique'
-            },
-            {
-                'name': 'Pacifica Indian Coconut Nectar',
-                'brand': 'Pacifica',
-                'scent_family': ['Warm', 'Exotic'],
-                'price_range': '$22-36',
-                'description': 'Warm coconut with vanilla and wood notes - tropical and cozy',
-                'where_to_buy': 'Target, Ulta, Whole Foods'
-            },
-            {
-                'name': 'Jo Malone Peony & Blush Suede',
-                'brand': 'Jo Malone',
-                'scent_family': ['Floral', 'Suede'],
-                'price_range': '$68-134',
-                'description': 'Soft floral with luxurious suede notes - elegant and feminine',
-                'where_to_buy': 'Sephora, Nordstrom'
-            },
-            {
-                'name': 'Nest Cedar Leaf & Lavender',
-                'brand': 'Nest',
-                'scent_family': ['Woody', 'Herbal'],
-                'price_range': '$45-68',
-                'description': 'Calming blend of cedar and lavender - perfect for relaxation',
-                'where_to_buy': 'Sephora, Nordstrom'
-            }
-        ]
-        
-        if count == 1:
-            return random.choice(perfumes)
-        else:
-            # Return multiple random choices without duplicates
-            shuffled = perfumes.copy()
-            random.shuffle(shuffled)
-            return shuffled[:min(count, len(shuffled))]
\ No newline at end of file
+        return pick_random(self._unseen('perfume', PERFUMES, count), count)
@@ -0,0 +1,80 @@
+"""
+Monthly Pack Agent - Static Assets
+Content-hashed CSS/JS URLs, served from memory with immutable cache headers
+"""
+
+import hashlib
+import mimetypes
+import threading
+from pathlib import Path
+from compression import CompressedVariants
+
+STATIC_DIR = Path(__file__).parent / 'static'
+ASSET_URL_PREFIX = '/static/'
+
+# A hashed URL never changes meaning, so browsers may keep it for a year without asking
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+class Asset:
+    """One static file: its bytes, content hash and hashed file name"""
+
+    def __init__(self, name, body):
+        self.name = name
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:12]
+        stem, dot, suffix = name.rpartition('.')
+        self.hashed_name = f"{stem}.{self.digest}.{suffix}" if dot else f"{name}.{self.digest}"
+        self.mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.compressed = CompressedVariants(body)
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+def get_manifest():
+    """{'css/pack.css': Asset, ...} and {'css/pack.<hash>.css': Asset, ...}, read once per process"""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                by_name, by_hashed_name = {}, {}
+                for path in sorted(STATIC_DIR.rglob('*')):
+                    if path.is_file():
+                        asset = Asset(path.relative_to(STATIC_DIR).as_posix(), path.read_bytes())
+                        by_name[asset.name] = asset
+                        by_hashed_name[asset.hashed_name] = asset
+                _manifest = (by_name, by_hashed_name)
+    return _manifest
+
+def asset_url(name):
+    """Hashed URL for a file under static/, e.g. /static/css/pack.1a2b3c4d5e6f.css"""
+    return ASSET_URL_PREFIX + get_manifest()[0][name].hashed_name
+
+def asset_version():
+    """Fingerprint of every asset, so pages that link them change when any asset does"""
+    return hashlib.sha256(''.join(asset.digest for asset in get_manifest()[0].values()).encode()).hexdigest()[:12]
+
+def serve_asset(filename):
+    """Serve a hashed asset as immutable; the plain name still works but must be revalidated"""
+    # Flask is only needed when serving; rendering imports this module for asset_url too
+    from flask import abort, make_response, request
+
+    by_name, by_hashed_name = get_manifest()
+    asset = by_hashed_name.get(filename)
+    cache_control = IMMUTABLE
+    if asset is None:
+        asset = by_name.get(filename)
+        cache_control = 'no-cache'
+    if asset is None:
+        abort(404)
+
+    response = make_response(asset.body)
+    response.mimetype = asset.mimetype
+    response.headers['Cache-Control'] = cache_control
+    response.set_etag(asset.digest)
+    response.compressed_variant = asset.compressed
+    return response.make_conditional(request)
+
+def register_assets(app):
+    """Serve static/ through serve_asset; create the app with static_folder=None so Flask's own route doesn't shadow it"""
+    app.add_url_rule(ASSET_URL_PREFIX + '<path:filename>', 'static_asset', serve_asset)
+    return app
@@ -0,0 +1,285 @@
+"""
+Monthly Pack Agent - Async Recommendation Service
+asyncio twin of RecommendationService built on a shared aiohttp connection pool
+"""
+
+import asyncio
+import threading
+import aiohttp
+from api_services import (
+    BOOK_SEARCH_TERMS, PODCAST_SEARCH_TERMS,
+    MOVIE_FALLBACKS, BOOK_FALLBACKS, PODCAST_FALLBACKS,
+    RED_WINES, BAY_AREA_HIKES, PERFUMES,
+    trending_request, book_search_request, podcast_search_request,
+    parse_trending, parse_books, parse_podcasts,
+    unique_by_title, pick, pick_random, default_cache
+)
+from candidate_cache import CANDIDATE_CACHE
+from circuit_breaker import BREAKERS, Deadline, ProviderUnavailable
+from catalog import get_catalog, catalog_lookup, catalog_store
+from dedup import get_history_index
+from providers import get_provider
+from config import *
+
+SERVICE_METHODS = [
+    'get_movie_recommendations',
+    'get_book_recommendations',
+    'get_podcast_recommendations',
+    'get_wine_recommendations',
+    'get_hiking_recommendations',
+    'get_perfume_recommendations'
+]
+
+class AsyncRecommendationService:
+    def __init__(self, max_concurrency=None, pool_size=20, cache=None, candidates=None, catalog=None, history=None):
+        self.max_concurrency = max_concurrency or SEARCH_CONCURRENCY
+        self.pool_size = pool_size
+        self.cache = cache if cache is not None else default_cache()
+        self.candidates = candidates if candidates is not None else CANDIDATE_CACHE
+        self.catalog = catalog if catalog is not None else get_catalog()
+        self.history = history if history is not None else get_history_index()
+        self.session = None
+        self.counters = {'connections_opened': 0, 'requests': 0, 'reused': 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get_session(self):
+        """Create the shared aiohttp session (and its connection pool) on first use"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30)
+            self.session = aiohttp.ClientSession(connector=connector, trace_configs=[self._trace_config()])
+        return self.session
+
+    def _trace_config(self):
+        """Count new vs reused connections for pool_stats()"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self.counters['requests'] += 1
+
+        async def on_connection_create_end(session, context, params):
+            self.counters['connections_opened'] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.counters['reused'] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def pool_stats(self):
+        """Connection pool counters, showing how often connections are reused"""
+        return {'aiohttp': dict(self.counters, limit=self.pool_size)}
+
+    async def close(self):
+        """Close the underlying connection pool"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def _get_json(self, provider, url, params, ttl=0, deadline=None):
+        """GET a provider endpoint and return its JSON body, or None on a non-200 response"""
+        entry = self.cache.get(url, params) if self.cache and ttl else None
+        if entry and self.cache.is_fresh(entry, ttl):
+            return entry['body']
+
+        headers = self.cache.revalidation_headers(entry) if entry else {}
+        deadline = deadline or Deadline()
+        connect, read = deadline.timeout(provider)
+        timeout = aiohttp.ClientTimeout(total=deadline.remaining(), connect=connect, sock_read=read)
+        breaker = BREAKERS[provider]
+        breaker.before_call()
+
+        session = await self._get_session()
+        try:
+            async with session.get(url, params=params, headers=headers, timeout=timeout) as response:
+                if response.status >= 500 or response.status == 429:
+                    breaker.record_failure()
+                    return None
+                breaker.record_success()
+
+                if response.status == 304 and entry:
+                    self.cache.refresh(url, params, entry)
+                    return entry['body']
+                if response.status == 200:
+                    data = await response.json(content_type=None)
+                    if self.cache and ttl:
+                        self.cache.store(url, params, data, response.headers)
+                    return data
+                return None
+        except (aiohttp.ClientError, asyncio.TimeoutError, asyncio.CancelledError):
+            # Cancellation here means the caller's deadline ran out mid-request
+            breaker.record_failure()
+            raise
+
+    async def _load_through_catalog(self, key, load, ttl):
+        """Answer from the catalog while it is fresh, otherwise load and record the result"""
+        # SQLite lookups are indexed and sub-millisecond, so they run inline on the loop
+        # A ttl of 0 turns caching off, catalog-first answers included
+        items = catalog_lookup(self.catalog, key, ttl) if self.catalog and CATALOG_FIRST and ttl != 0 else []
+        if not items:
+            items = await load()
+            if items and self.catalog:
+                catalog_store(self.catalog, key, items)
+        return items
+
+    async def _cached_candidates(self, key, load, ttl):
+        """Normalized candidates for a (provider, query) key, from memory or the catalog when possible"""
+        if not self.candidates:
+            return await self._load_through_catalog(key, load, ttl)
+        value = self.candidates.get(key)
+        if value is None:
+            value = await self._load_through_catalog(key, load, ttl)
+            if value:
+                self.candidates.put(key, value, ttl)
+        return value
+
+    def _unseen(self, category, items, count):
+        """Candidates not recommended in a past pack, falling back to repeats when needed"""
+        return self.history.prefer_unseen(category, items, count) if self.history else items
+
+    async def _fetch_all_terms(self, fetch_term, search_terms, deadline):
+        """Run fetch_term for every search term concurrently, returning results in term order.
+
+        A term that fails or misses the deadline contributes an empty list.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def bounded(term):
+            try:
+                async with semaphore:
+                    return await asyncio.wait_for(fetch_term(term), deadline.remaining())
+            except Exception as e:
+                print(f"Error fetching '{term}': {e or type(e).__name__}")
+                return []
+
+        # gather() preserves argument order, so merged output matches the sync service
+        return await asyncio.gather(*(bounded(term) for term in search_terms))
+
+    async def get_movie_recommendations(self, user_prefs, count=1, live_only=False):
+        """Get movie/TV recommendations from TMDB"""
+        try:
+            deadline = Deadline()
+            ttl = get_provider('entertainment').cache_ttl()
+
+            async def fetch_trending():
+                data = await self._get_json('tmdb', *trending_request(), ttl=ttl, deadline=deadline)
+                return parse_trending(data) if data else []
+
+            all_content = await self._cached_candidates(('tmdb', 'trending'), fetch_trending, ttl)
+            if all_content:
+                return pick(self._unseen('entertainment', all_content, count), count)
+        except Exception as e:
+            print(f"Error fetching movies/TV: {e}")
+
+        if live_only:
+            raise ProviderUnavailable("TMDB gave no results")
+        return pick(self._unseen('entertainment', MOVIE_FALLBACKS, count), count)
+
+    async def get_book_recommendations(self, user_prefs, count=1, live_only=False):
+        """Get book recommendations from Google Books"""
+        try:
+            deadline = Deadline()
+            ttl = get_provider('book').cache_ttl()
+
+            async def fetch_books(search_query):
+                async def load():
+                    data = await self._get_json('books', *book_search_request(search_query), ttl=ttl, deadline=deadline)
+                    return parse_books(data) if data else []
+                return await self._cached_candidates(('books', search_query), load, ttl)
+
+            all_books = []
+            for books_found in await self._fetch_all_terms(fetch_books, BOOK_SEARCH_TERMS[:3], deadline):
+                all_books.extend(books_found)
+
+            if all_books:
+                return pick(self._unseen('book', unique_by_title(all_books), count), count)
+        except Exception as e:
+            print(f"Error fetching books: {e}")
+
+        if live_only:
+            raise ProviderUnavailable("Google Books gave no results")
+        return pick(self._unseen('book', BOOK_FALLBACKS, count), count)
+
+    async def get_podcast_recommendations(self, user_prefs, count=1, live_only=False):
+        """Get podcast recommendations from iTunes"""
+        try:
+            deadline = Deadline()
+            ttl = get_provider('podcast').cache_ttl()
+
+            async def fetch_podcasts(search_term):
+                async def load():
+                    data = await self._get_json('itunes', *podcast_search_request(search_term), ttl=ttl, deadline=deadline)
+                    return parse_podcasts(data, search_term) if data else []
+                return await self._cached_candidates(('itunes', search_term), load, ttl)
+
+            all_podcasts = []
+            for podcasts_found in await self._fetch_all_terms(fetch_podcasts, PODCAST_SEARCH_TERMS[:4], deadline):
+                all_podcasts.extend(podcasts_found)
+
+            if all_podcasts:
+                return pick(self._unseen('podcast', unique_by_title(all_podcasts), count), count)
+        except Exception as e:
+            print(f"Error fetching podcasts: {e}")
+
+        if live_only:
+            raise ProviderUnavailable("iTunes gave no results")
+        return pick(self._unseen('podcast', PODCAST_FALLBACKS, count), count)
+
+    async def get_wine_recommendations(self, user_prefs, count=1):
+        """Get wine recommendations - manual curated list"""
+        return pick_random(self._unseen('wine', RED_WINES, count), count)
+
+    async def get_hiking_recommendations(self, user_prefs, count=1):
+        """Get hiking recommendations for Bay Area"""
+        return pick_random(self._unseen('hiking', BAY_AREA_HIKES, count), count)
+
+    async def get_perfume_recommendations(self, user_prefs, count=1):
+        """Get perfume recommendations - curated list"""
+        return pick_random(self._unseen('perfume', PERFUMES, count), count)
+
+# One event loop thread and one async service per process, shared by every
+# BlockingRecommendationService so sync callers reuse the same connection pool.
+_loop = None
+_shared_service = None
+_loop_lock = threading.Lock()
+
+def _get_loop():
+    """Start the background event loop thread on first use"""
+    global _loop, _shared_service
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name='async-recommendations', daemon=True)
+            thread.start()
+            _shared_service = AsyncRecommendationService()
+    return _loop
+
+def run_blocking(coro, timeout=None):
+    """Run a coroutine on the shared loop from synchronous code and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result(timeout)
+
+class BlockingRecommendationService:
+    """Drop-in synchronous facade over the shared AsyncRecommendationService.
+
+    Lets Flask handlers opt into the async client without becoming async views.
+    """
+
+    def pool_stats(self):
+        _get_loop()
+        return _shared_service.pool_stats()
+
+    def __getattr__(self, name):
+        if name not in SERVICE_METHODS:
+            raise AttributeError(name)
+
+        _get_loop()
+        method = getattr(_shared_service, name)
+
+        def call(user_prefs, count=1, **options):
+            return run_blocking(method(user_prefs, count, **options))
+        return call
@@ -0,0 +1,63 @@
+"""
+Monthly Pack Agent - Atomic File Writes
+Write-then-rename with fsync and an advisory writer lock, so readers never see partial files
+"""
+
+import os
+import json
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: os.replace is still atomic, writers just aren't serialized
+    fcntl = None
+
+@contextmanager
+def writer_lock(path):
+    """Exclusive advisory lock on <path>.lock, held by one writer at a time.
+
+    Only writers take it; readers open the file directly and never block.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _fsync_directory(directory):
+    """Persist the rename itself, not just the file contents"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def atomic_write_text(path, text):
+    """Replace `path` with `text` so readers see either the old or the new file, never a mix"""
+    directory = os.path.dirname(os.path.abspath(path))
+    with writer_lock(path):
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates 0600 files; keep the usual permissions of the file being replaced
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        _fsync_directory(directory)
+
+def atomic_write_json(path, data, indent=2):
+    """JSON version of atomic_write_text, serialized before the lock is taken"""
+    atomic_write_text(path, json.dumps(data, indent=indent))
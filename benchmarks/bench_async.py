@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Monthly Pack Agent - Sync vs Async Service Benchmark
+Times a full six-category fetch against the local provider stand-in
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_server import start_standin_server, standin_env
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare RecommendationService and AsyncRecommendationService offline')
+    parser.add_argument('--latency', type=float, default=0.1,
+                       help='Stand-in response latency in seconds (default: 0.1)')
+    parser.add_argument('--rounds', type=int, default=5,
+                       help='Full packs to fetch per service (default: 5)')
+    args = parser.parse_args()
+
+    server = start_standin_server(latency=args.latency)
+    # Base URLs are read when config is imported, so point it at the stand-in first
+    os.environ.update(standin_env(server))
+
+    from api_services import RecommendationService
+    from async_api_services import AsyncRecommendationService, SERVICE_METHODS
+
+    # Measure the network path, not the response cache, candidate cache or catalog
+    sync_service = RecommendationService(cache=False, candidates=False, catalog=False)
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for method_name in SERVICE_METHODS:
+            getattr(sync_service, method_name)({}, 3)
+    sync_seconds = (time.perf_counter() - started) / args.rounds
+
+    async def run_async():
+        async with AsyncRecommendationService(cache=False, candidates=False, catalog=False) as async_service:
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                await asyncio.gather(*(getattr(async_service, name)({}, 3) for name in SERVICE_METHODS))
+            return (time.perf_counter() - started) / args.rounds
+    async_seconds = asyncio.run(run_async())
+
+    server.shutdown()
+
+    print(f"🧪 Stand-in latency: {args.latency * 1000:.0f} ms per response, {args.rounds} rounds")
+    print(f"   sync  (one category at a time): {sync_seconds * 1000:8.1f} ms per pack")
+    print(f"   async (all categories at once): {async_seconds * 1000:8.1f} ms per pack")
+    print(f"   speedup: {sync_seconds / async_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Monthly Pack Agent - Response Compression Benchmark
+Bytes on the wire for the index page and API responses, uncompressed vs gzip vs brotli
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENCODINGS = [('identity', 'identity'), ('gzip', 'gzip'), ('br', 'br, gzip')]
+
+def measure(client, path, accept_encoding, rounds):
+    """(bytes sent, average ms) for one path and Accept-Encoding"""
+    response = client.get(path, headers={'Accept-Encoding': accept_encoding})
+    started = time.perf_counter()
+    for _ in range(rounds):
+        client.get(path, headers={'Accept-Encoding': accept_encoding})
+    return len(response.data), response.headers.get('Content-Encoding', '-'), (time.perf_counter() - started) / rounds * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare response sizes with and without compression')
+    parser.add_argument('--rounds', type=int, default=200, help='Requests per measurement (default: 200)')
+    args = parser.parse_args()
+
+    # Run from the project directory so the apps find recommendations.json
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import web_server
+    from compression import brotli
+
+    client = web_server.app.test_client()
+    paths = ['/', '/api/search?q=s&limit=50', '/api/search?q=jo+malone', '/api/stats']
+
+    print(f"🧪 {args.rounds} requests per row (brotli {'available' if brotli else 'not installed'})")
+    print(f"   {'path':<26} {'encoding':<9} {'bytes':>8} {'saved':>7} {'ms/req':>8}")
+    for path in paths:
+        baseline = None
+        for _, accept_encoding in ENCODINGS:
+            size, encoding, ms = measure(client, path, accept_encoding, args.rounds)
+            baseline = baseline or size
+            saved = f"{(1 - size / baseline) * 100:.0f}%"
+            print(f"   {path:<26} {encoding:<9} {size:>8} {saved:>7} {ms:>8.3f}")
+
+if __name__ == "__main__":
+    main()
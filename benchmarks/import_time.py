@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Monthly Pack Agent - Import Time Benchmark
+Cold-start cost of each entry point, from `python -X importtime` in a fresh interpreter
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ['generate_pack', 'simple_web', 'web_server']
+
+def import_times(module):
+    """{imported module: (self us, cumulative us)} for everything one cold import of `module` pulled in"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            cwd=PROJECT_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = len(name) - len(name.lstrip())
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+
+    # Children are printed before their parent; walk back from the module's own line
+    # until the previous top-level import (interpreter start-up such as site)
+    position = max(index for index, entry in enumerate(entries) if entry[0] == module)
+    times = {module: entries[position][2:]}
+    for name, depth, self_us, cumulative_us in reversed(entries[:position]):
+        if depth <= entries[position][1]:
+            break
+        times[name] = (self_us, cumulative_us)
+    return times
+
+def report(module, runs, top):
+    """Median cumulative import time over `runs` cold starts, plus the heaviest modules it pulled in"""
+    samples = [import_times(module) for _ in range(runs)]
+    totals = [sample[module][1] for sample in samples]
+    print(f"📦 {module}: median {statistics.median(totals) / 1000:.1f} ms "
+          f"(min {min(totals) / 1000:.1f}, max {max(totals) / 1000:.1f}) over {runs} runs")
+
+    # Heaviest modules by cumulative time in the median run, skipping the entry point itself
+    median_run = sorted(samples, key=lambda sample: sample[module][1])[len(samples) // 2]
+    heaviest = sorted(((cumulative, name) for name, (_, cumulative) in median_run.items() if name != module),
+                      reverse=True)
+    for cumulative, name in heaviest[:top]:
+        print(f"   {cumulative / 1000:>8.1f} ms  {name}")
+    loaded = [name for name in ('flask', 'jinja2', 'requests', 'aiohttp', 'sqlite3', 'smtplib') if name in median_run]
+    print(f"   heavy dependencies loaded: {', '.join(loaded) or 'none'}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold import time of the CLI and web entry points')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES,
+                        help=f"modules to import (default: {' '.join(DEFAULT_MODULES)})")
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module (default: 5)')
+    parser.add_argument('--top', type=int, default=8, help='Heaviest imports listed per module (default: 8)')
+    args = parser.parse_args()
+
+    for module in args.modules:
+        report(module, args.runs, args.top)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Monthly Pack Agent - End-to-End Benchmark Suite
+Times pack generation, page rendering and the Flask routes against the seeded provider stand-in,
+writes p50/p95/p99, throughput and peak memory to JSON, and can compare a run with a stored baseline
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from standin_server import start_standin_server, standin_env, parse_latency
+
+DEFAULT_OUTPUT = os.path.join(PROJECT_DIR, 'benchmarks', 'results.json')
+
+# Compared against the baseline; for throughput lower is worse, for the rest higher is worse.
+# p99 is only reported: over a few dozen runs it is close to the single slowest one
+COMPARED_METRICS = ('p50_ms', 'p95_ms', 'throughput_per_s', 'peak_memory_kib')
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, -(-len(samples) * percent // 100))
+    return samples[int(rank) - 1]
+
+def measure(run, iterations, warmup):
+    """Timings and peak traced memory for `run`, with its prints discarded"""
+    with redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            run()
+
+        samples = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            began = time.perf_counter()
+            run()
+            samples.append(time.perf_counter() - began)
+        elapsed = time.perf_counter() - started
+
+        # One more run under tracemalloc, kept out of the timings it would slow down
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 3),
+        'throughput_per_s': round(iterations / elapsed, 1),
+        'peak_memory_kib': round(peak / 1024, 1)
+    }
+
+def build_cases():
+    """[(name, callable)] in run order, after generating one pack so the pages have something to show"""
+    import generate_pack
+    import web_server
+
+    with redirect_stdout(io.StringIO()):
+        if not generate_pack.generate_monthly_pack(parallel=True):
+            raise RuntimeError("could not generate the setup pack")
+    client = web_server.app.test_client()
+
+    def get(path):
+        def run():
+            response = client.get(path)
+            response.get_data()  # drain streamed bodies too
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {path} returned {response.status_code}")
+        return run
+
+    def render_interactive_page():
+        with open('recommendations.json', 'r') as f:
+            pack = json.load(f)
+        return ''.join(web_server.stream_interactive_html(pack))
+
+    return [
+        ('generate_monthly_pack', lambda: generate_pack.generate_monthly_pack(parallel=True)),
+        ('generate_monthly_pack_async', lambda: generate_pack.generate_monthly_pack(use_async=True)),
+        ('generate_html', generate_pack.generate_html),
+        ('render_interactive_page', render_interactive_page),
+        ('GET /', get('/')),
+        ('GET /api/refresh/book', get('/api/refresh/book')),
+        ('GET /api/more/podcast', get('/api/more/podcast')),
+        ('GET /api/refresh/all', get('/api/refresh/all')),
+        ('GET /api/stream/refresh/all', get('/api/stream/refresh/all')),
+        ('GET /api/batch', get('/api/batch?categories=entertainment,book,podcast&count=3')),
+        ('GET /api/search', get('/api/search?q=book')),
+        ('GET /api/stats', get('/api/stats'))
+    ]
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Print each case against the baseline; returns the regressions as (case, metric, old, new)"""
+    regressions = []
+    print(f"\n📊 Compared with baseline from {baseline.get('created', '?')} (threshold {threshold:.0%})")
+    for key, value in results['settings'].items():
+        if key != 'iterations' and baseline.get('settings', {}).get(key) != value:
+            print(f"   ⚠️ baseline used {key}={baseline.get('settings', {}).get(key)!r}, this run {value!r}")
+    for name, metrics in results['cases'].items():
+        old_metrics = baseline.get('cases', {}).get(name)
+        if old_metrics is None:
+            print(f"   {name:<30} new case, no baseline")
+            continue
+        notes = []
+        for metric in COMPARED_METRICS:
+            old, new = old_metrics.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (old - new) / old if metric == 'throughput_per_s' else (new - old) / old
+            # Sub-millisecond cases swing by large ratios on timer noise alone
+            if metric.endswith('_ms') and new - old < min_delta_ms:
+                continue
+            if metric == 'throughput_per_s' and new and 1000 / new - 1000 / old < min_delta_ms:
+                continue
+            if change > threshold:
+                regressions.append((name, metric, old, new))
+                notes.append(f"{metric} {old} -> {new}")
+        status = "❌ " + "; ".join(notes) if notes else "✅ ok"
+        print(f"   {name:<30} {status}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pack generation, rendering and the web routes offline')
+    parser.add_argument('--iterations', type=int, default=30, help='Timed runs per case (default: 30)')
+    parser.add_argument('--warmup', type=int, default=2, help='Untimed runs per case first (default: 2)')
+    parser.add_argument('--latency', type=parse_latency, default=0.02,
+                       help='Stand-in latency in seconds, or per provider: tmdb=0.2,books=0.8 (default: 0.02)')
+    parser.add_argument('--fixtures', default=None,
+                       help='Replay recorded provider responses from this directory instead of synthetic ones')
+    parser.add_argument('--cold', action='store_true',
+                       help='Turn off the response cache, candidate cache and catalog-first answers, so every call reaches the stand-in')
+    parser.add_argument('--only', action='append', default=[],
+                       help='Run only cases whose name contains this text (repeatable)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f"Where to write results (default: {DEFAULT_OUTPUT})")
+    parser.add_argument('--compare', metavar='BASELINE', help='Results file to compare against; exits 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                       help='Relative change counted as a regression (default: 0.2 = 20%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                       help='Latency increases smaller than this are never regressions (default: 1.0)')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+
+    # Seeded stand-in, no jitter or errors, so runs differ only by the code under test
+    server = start_standin_server(latency=args.latency, fixtures=args.fixtures, seed=0)
+
+    # Work in a scratch copy so packs, history, caches and the catalog never touch the real ones
+    workdir = tempfile.mkdtemp(prefix='monthly-pack-bench-')
+    shutil.copy2(os.path.join(PROJECT_DIR, 'user_data.json'), workdir)
+    os.chdir(workdir)
+    os.environ.update(standin_env(server))
+    os.environ.update({
+        'HTTP_CACHE_DIR': os.path.join(workdir, '.http_cache'),
+        'CATALOG_PATH': os.path.join(workdir, 'catalog.db'),
+        'WARM_POOL_ENABLED': 'False',
+        'EMAIL_ENABLED': 'False'
+    })
+    if args.cold:
+        os.environ.update({'HTTP_CACHE_ENABLED': 'False', 'CANDIDATE_CACHE_SIZE': '0', 'CATALOG_FIRST': 'False'})
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'iterations': args.iterations, 'warmup': args.warmup,
+                     'latency': args.latency, 'fixtures': args.fixtures, 'cold': args.cold},
+        'cases': {}
+    }
+
+    print(f"🧪 {args.iterations} runs per case after {args.warmup} warm-up, stand-in latency {args.latency}"
+          f"{', caches off' if args.cold else ''}")
+    print(f"   {'case':<30} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>8} {'peak KiB':>9}")
+    try:
+        for name, run in build_cases():
+            if args.only and not any(text in name for text in args.only):
+                continue
+            try:
+                metrics = measure(run, args.iterations, args.warmup)
+            except Exception as e:
+                print(f"   {name:<30} ❌ {e}")
+                continue
+            results['cases'][name] = metrics
+            print(f"   {name:<30} {metrics['p50_ms']:>9.2f} {metrics['p95_ms']:>9.2f} {metrics['p99_ms']:>9.2f} "
+                  f"{metrics['throughput_per_s']:>8.1f} {metrics['peak_memory_kib']:>9.1f}")
+    finally:
+        os.chdir(PROJECT_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+        server.shutdown()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Monthly Pack Agent - Atomic Write Stress Test
+Hammers one pack file with concurrent writer processes and reader threads
+and counts every read that isn't a complete pack
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from multiprocessing import Process
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atomic_io import atomic_write_json
+
+def make_pack(writer_id, sequence):
+    """A pack whose size varies between writes, so torn reads are easy to hit"""
+    padding = 'x' * (2000 + (sequence * 997 + writer_id * 131) % 60000)
+    return {'writer': writer_id, 'sequence': sequence, 'padding': padding, 'complete': True}
+
+def naive_write(path, pack):
+    """The old write path: truncate and rewrite in place"""
+    with open(path, 'w') as f:
+        json.dump(pack, f, indent=2)
+
+def writer(path, writer_id, seconds, naive):
+    write = naive_write if naive else atomic_write_json
+    sequence = 0
+    stop_at = time.monotonic() + seconds
+    while time.monotonic() < stop_at:
+        write(path, make_pack(writer_id, sequence))
+        sequence += 1
+
+def reader(path, seconds, counters, lock):
+    reads = failures = 0
+    stop_at = time.monotonic() + seconds
+    while time.monotonic() < stop_at:
+        try:
+            with open(path, 'r') as f:
+                pack = json.load(f)
+            if not pack.get('complete'):
+                raise ValueError("incomplete pack")
+        except (ValueError, FileNotFoundError):
+            failures += 1
+        reads += 1
+    with lock:
+        counters['reads'] += reads
+        counters['failures'] += failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that pack readers never see partial JSON while writers run')
+    parser.add_argument('--writers', type=int, default=4, help='Concurrent writer processes (default: 4)')
+    parser.add_argument('--readers', type=int, default=8, help='Concurrent reader threads (default: 8)')
+    parser.add_argument('--seconds', type=float, default=5, help='How long to run (default: 5)')
+    parser.add_argument('--naive', action='store_true', help='Use the old in-place write, to show the failure mode')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'recommendations.json')
+        atomic_write_json(path, make_pack(-1, 0))
+
+        writers = [Process(target=writer, args=(path, i, args.seconds, args.naive)) for i in range(args.writers)]
+        counters = {'reads': 0, 'failures': 0}
+        lock = threading.Lock()
+        readers = [threading.Thread(target=reader, args=(path, args.seconds, counters, lock)) for _ in range(args.readers)]
+
+        for worker in writers + readers:
+            worker.start()
+        for worker in writers + readers:
+            worker.join()
+
+        final_ok = json.load(open(path)).get('complete', False)
+
+    mode = 'in-place' if args.naive else 'atomic'
+    print(f"🧪 {args.writers} writers, {args.readers} readers, {args.seconds:.0f}s, {mode} writes")
+    print(f"   reads: {counters['reads']}, partial or unreadable: {counters['failures']}")
+    print(f"   final file complete: {final_ok}")
+    if counters['failures'] or not final_ok:
+        print("❌ Readers saw partial packs")
+        sys.exit(1)
+    print("✅ Every read saw a complete pack")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Monthly Pack Agent - Candidate Cache
+In-process LRU cache of normalized candidate lists keyed by (provider, query)
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from config import *
+
+class LRUCache:
+    """Size-bounded, thread-safe LRU cache with optional per-entry TTL and hit/miss counters"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, count_miss=True):
+        """Return the cached value, or None on a miss or expired entry.
+
+        count_miss=False is for callers that fall back to get_or_load(), which counts the miss itself.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            if count_miss:
+                self.misses += 1
+            return None
+
+    def put(self, key, value, ttl=None):
+        """Store a value for ttl seconds (None: until evicted; 0: not at all), evicting past maxsize"""
+        if ttl == 0:
+            return
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, load, ttl=None):
+        """Return the cached value or call load() and cache a non-empty result; ttl=0 bypasses the cache"""
+        if ttl == 0:
+            return load()
+        value = self.get(key)
+        if value is None:
+            value = load()
+            # Empty results usually mean the provider failed; don't pin them
+            if value:
+                self.put(key, value, ttl)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters for the /api/stats endpoint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+# Shared by every RecommendationService in the process. Cached lists are
+# handed out as-is, so callers must copy before mutating them.
+CANDIDATE_CACHE = LRUCache(maxsize=CANDIDATE_CACHE_SIZE)
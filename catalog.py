@@ -0,0 +1,220 @@
+"""
+Monthly Pack Agent - Local Catalog
+SQLite (WAL) store of every normalized item we've fetched, with FTS5 search
+"""
+
+import json
+import time
+import threading
+from config import *
+from dedup import item_key
+from sqlite_store import SQLiteStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    creator TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    UNIQUE (category, title_key)
+);
+
+-- Which items each provider query returned, in provider order; one item can belong to many queries
+CREATE TABLE IF NOT EXISTS query_items (
+    category TEXT NOT NULL,
+    source_query TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    item_id INTEGER NOT NULL REFERENCES items (id),
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (category, source_query, position)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, creator, description,
+    content='items', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts (rowid, title, creator, description)
+    VALUES (new.id, new.title, new.creator, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, creator, description)
+    VALUES ('delete', old.id, old.title, old.creator, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts (items_fts, rowid, title, creator, description)
+    VALUES ('delete', old.id, old.title, old.creator, old.description);
+    INSERT INTO items_fts (rowid, title, creator, description)
+    VALUES (new.id, new.title, new.creator, new.description);
+END;
+"""
+
+UPSERT = """
+INSERT INTO items (category, title, title_key, creator, description, data, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (category, title_key) DO UPDATE SET
+    title = excluded.title,
+    creator = excluded.creator,
+    description = excluded.description,
+    data = excluded.data,
+    last_seen = excluded.last_seen
+"""
+
+# Field holding the "who/where" of an item, per category
+CREATOR_FIELDS = {
+    'entertainment': 'type',
+    'book': 'author',
+    'podcast': 'creator',
+    'wine': 'region',
+    'hiking': 'location',
+    'perfume': 'brand'
+}
+
+def fts_query(text):
+    """Turn free text into a safe FTS5 prefix query ("word"* AND ...)"""
+    words = [''.join(ch for ch in word if ch.isalnum()) for word in text.split()]
+    return ' '.join(f'"{word}"*' for word in words if word)
+
+class Catalog(SQLiteStore):
+    SCHEMA = SCHEMA
+    # Losing the last commits on power loss is fine for a cache of provider answers
+    PRAGMAS = ('synchronous=NORMAL',)
+
+    def __init__(self, path=None):
+        super().__init__(path or CATALOG_PATH)
+
+    def upsert_items(self, category, items, source_query=None):
+        """Insert or refresh a list of normalized items in one transaction.
+
+        With a source_query, the list also replaces that query's membership,
+        so items_for_query returns exactly this list in this order.
+        """
+        now = time.time()
+        rows = {}
+        for item in items:
+            title = item.get('title') or item.get('name', '')
+            if not title:
+                continue
+            # Same key as the history index, so "The Crown" and "Crown, The" are one row
+            key = item_key(item) or title.casefold()
+            if key in rows:
+                continue
+            rows[key] = (
+                category, title, key,
+                str(item.get(CREATOR_FIELDS.get(category, ''), '') or ''),
+                item.get('description', '') or '',
+                json.dumps(item), now, now
+            )
+
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                connection.executemany(UPSERT, rows.values())
+                if source_query is None:
+                    return
+                ids = {}
+                keys = list(rows)
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ', '.join('?' * len(chunk))
+                    for row in connection.execute(
+                            f"SELECT id, title_key FROM items WHERE category = ? AND title_key IN ({placeholders})",
+                            [category, *chunk]):
+                        ids[row['title_key']] = row['id']
+                connection.execute("DELETE FROM query_items WHERE category = ? AND source_query = ?",
+                                   (category, source_query))
+                connection.executemany(
+                    "INSERT INTO query_items (category, source_query, position, item_id, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    [(category, source_query, position, ids[key], now) for position, key in enumerate(keys)])
+
+    def items_for_query(self, category, source_query, max_age=None):
+        """Items last fetched for a provider query, in provider order, if fetched within max_age seconds"""
+        sql = """
+            SELECT items.data
+            FROM query_items JOIN items ON items.id = query_items.item_id
+            WHERE query_items.category = ? AND query_items.source_query = ?
+        """
+        params = [category, source_query]
+        if max_age is not None:
+            sql += " AND query_items.fetched_at >= ?"
+            params.append(time.time() - max_age)
+        sql += " ORDER BY query_items.position"
+        rows = self._connection().execute(sql, params).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def search(self, text, category=None, limit=20):
+        """Full-text search over title, author/creator and description, best matches first"""
+        query = fts_query(text)
+        if not query:
+            return []
+
+        sql = """
+            SELECT items.category, items.data
+            FROM items_fts JOIN items ON items.id = items_fts.rowid
+            WHERE items_fts MATCH ?
+        """
+        params = [query]
+        if category:
+            sql += " AND items.category = ?"
+            params.append(category)
+        # Title matches outrank creator matches, which outrank description matches
+        sql += " ORDER BY bm25(items_fts, 10.0, 5.0, 1.0) LIMIT ?"
+        params.append(limit)
+
+        rows = self._connection().execute(sql, params).fetchall()
+        return [dict(json.loads(row['data']), category=row['category']) for row in rows]
+
+    def stats(self):
+        rows = self._connection().execute(
+            "SELECT category, COUNT(*) AS items FROM items GROUP BY category").fetchall()
+        return {row['category']: row['items'] for row in rows}
+
+# Catalog category for each upstream provider's candidate lists
+PROVIDER_CATEGORIES = {'tmdb': 'entertainment', 'books': 'book', 'itunes': 'podcast'}
+
+def catalog_lookup(catalog, key, max_age=None):
+    """Catalogued items for a (provider, query) key; [] when absent, stale or unreadable"""
+    provider, query = key
+    try:
+        return catalog.items_for_query(PROVIDER_CATEGORIES[provider], query, max_age)
+    except Exception as e:
+        print(f"⚠️ Catalog lookup failed: {e}")
+        return []
+
+def catalog_store(catalog, key, items):
+    """Upsert freshly fetched items for a (provider, query) key; never fails the caller"""
+    provider, query = key
+    try:
+        catalog.upsert_items(PROVIDER_CATEGORIES[provider], items, source_query=query)
+    except Exception as e:
+        print(f"⚠️ Catalog update failed: {e}")
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_catalog():
+    """Process-wide catalog, seeded with the curated wine/hiking/perfume lists; None when disabled"""
+    global _catalog
+    if not CATALOG_ENABLED:
+        return None
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                from api_services import RED_WINES, BAY_AREA_HIKES, PERFUMES
+                try:
+                    catalog = Catalog()
+                    catalog.upsert_items('wine', RED_WINES)
+                    catalog.upsert_items('hiking', BAY_AREA_HIKES)
+                    catalog.upsert_items('perfume', PERFUMES)
+                    _catalog = catalog
+                except Exception as e:
+                    # Recommendations still work without it, just without search
+                    print(f"⚠️ Catalog unavailable: {e}")
+                    return None
+    return _catalog
@@ -0,0 +1,93 @@
+"""
+Monthly Pack Agent - Circuit Breaker and Deadlines
+Keeps a failing provider from stalling requests before the fallbacks are reached
+"""
+
+import time
+import threading
+from config import *
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+class DeadlineExceeded(Exception):
+    """Raised when a recommendation call has used up its time budget"""
+
+class ProviderUnavailable(Exception):
+    """Raised instead of returning the curated fallbacks when a caller asked for live results only"""
+
+class Deadline:
+    """Overall time budget for one recommendation call"""
+
+    def __init__(self, seconds=None):
+        self.expires_at = time.monotonic() + (seconds if seconds is not None else REQUEST_DEADLINE)
+
+    def remaining(self):
+        """Seconds left, raising DeadlineExceeded once the budget is spent"""
+        remaining = self.expires_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("request deadline exceeded")
+        return remaining
+
+    def timeout(self, provider):
+        """(connect, read) timeout for a provider call, capped by the time left"""
+        connect, read = PROVIDER_TIMEOUTS.get(provider, (3.0, 5.0))
+        remaining = self.remaining()
+        return (min(connect, remaining), min(read, remaining))
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probe after a cool-down"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=None, reset_timeout=None):
+        self.name = name
+        self.failure_threshold = failure_threshold or BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or BREAKER_RESET_TIMEOUT
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go upstream right now"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"{self.name} circuit is open")
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN:
+                # Let exactly one probe through; everyone else keeps using fallbacks
+                if self._probe_in_flight:
+                    raise CircuitOpenError(f"{self.name} circuit is half-open")
+                self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures}
+
+# One breaker per upstream provider, shared across every service instance
+BREAKERS = {name: CircuitBreaker(name) for name in ('tmdb', 'books', 'itunes')}
+
+def breaker_stats():
+    """Breaker states for the /api/stats endpoint"""
+    return {name: breaker.stats() for name, breaker in BREAKERS.items()}
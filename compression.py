@@ -0,0 +1,99 @@
+"""
+Monthly Pack Agent - Response Compression
+Negotiated gzip/brotli for Flask responses, with pre-compressed variants for cached pages
+"""
+
+import gzip
+from config import *
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('text/html', 'text/css', 'text/plain', 'application/json',
+                      'application/javascript', 'text/javascript')
+
+def accepted_encodings(header):
+    """Encodings the client accepts with a non-zero q-value"""
+    accepted = set()
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+def choose_encoding(header):
+    """Best encoding we can produce for an Accept-Encoding header, or None"""
+    accepted = accepted_encodings(header)
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+def compress(data, encoding, best=False):
+    """Compress bytes; `best` trades CPU for size and is meant for bodies compressed once and reused"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if best else GZIP_LEVEL, mtime=0)
+
+class CompressedVariants:
+    """A body's compressed copies at the highest level, made once per encoding; call it with the encoding"""
+
+    def __init__(self, body):
+        self.body = body
+        self._variants = {}
+
+    def __call__(self, encoding):
+        variant = self._variants.get(encoding)
+        if variant is None:
+            variant = self._variants[encoding] = compress(self.body, encoding, best=True)
+        return variant
+
+def compress_response(response):
+    """after_request hook: compress eligible responses for clients that accept it"""
+    # Imported here so compress() stays usable without loading Flask (e.g. generate_pack.py)
+    from flask import request
+
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+
+    # Streamed and file responses pass through untouched; so do empty and already-encoded ones
+    if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+            or response.status_code < 200 or response.status_code in (204, 304)):
+        return response
+
+    encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    # Cached pages carry their own compressed copies, made once per encoding
+    variant = getattr(response, 'compressed_variant', None)
+    body = variant(encoding) if variant is not None else compress(data, encoding)
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    # Same content, different bytes: keep the validator but make it weak
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def enable_compression(app):
+    """Compress every response of a Flask app when COMPRESSION_ENABLED is set"""
+    if COMPRESSION_ENABLED:
+        app.after_request(compress_response)
+    return app
@@ -1,38 +1,168 @@
 # API Configuration for Monthly Pack Agent
 # All APIs used are FREE
+#
+# Importing config reads nothing: the environment and api_keys.env are read,
+# and each setting cast, the first time a setting is looked up, then cached.
+# `from config import *` and `from config import NAME` look their names up
+# (all of them, for *) when the importing module loads, so modules on the
+# CLI path (generate_pack, providers, profile_cache) `import config` and read
+# config.NAME where it's used instead; get_settings() returns the Settings.
 
 import os
+import threading
+from functools import cached_property
 from pathlib import Path
 
-def load_env_file():
-    """Load environment variables from api_keys.env file"""
-    env_file = Path(__file__).parent / "api_keys.env"
-    if env_file.exists():
-        with open(env_file, 'r') as f:
+ENV_FILE = Path(__file__).parent / "api_keys.env"
+
+def load_env_file(path=ENV_FILE):
+    """Read KEY=value lines from api_keys.env into a dict (os.environ is left alone)"""
+    values = {}
+    if path.exists():
+        with open(path, 'r') as f:
             for line in f:
                 line = line.strip()
                 if line and not line.startswith('#') and '=' in line:
                     key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+                    values[key.strip()] = value.strip()
+    return values
+
+def flag(value):
+    return value.lower() == "true"
+
+class setting:
+    """One setting: the environment variable of the same name, cast on first access and cached"""
+
+    def __init__(self, default, cast=str):
+        self.default = default
+        self.cast = cast
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, settings, owner=None):
+        if settings is None:
+            return self
+        value = self.cast(settings.env.get(self.name, self.default))
+        settings.__dict__[self.name] = value
+        return value
+
+class Settings:
+    """Every setting; api_keys.env overrides the process environment, as it always has"""
+
+    @cached_property
+    def env(self):
+        return {**os.environ, **load_env_file()}
+
+    # TMDB (The Movie Database) - FREE
+    TMDB_API_KEY = setting("test_key")
+    TMDB_BASE_URL = setting("https://api.themoviedb.org/3")
+
+    # Google Books API - FREE
+    GOOGLE_BOOKS_API_KEY = setting("test_key")
+    GOOGLE_BOOKS_BASE_URL = setting("https://www.googleapis.com/books/v1")
+
+    # iTunes Podcasts - FREE (no key needed)
+    ITUNES_BASE_URL = setting("https://itunes.apple.com/search")
+
+    # Maximum concurrent search-term queries per provider (books, podcasts)
+    SEARCH_CONCURRENCY = setting("4", int)
+
+    # Per-provider (connect, read) timeouts in seconds
+    @cached_property
+    def PROVIDER_TIMEOUTS(self):
+        return {
+            'tmdb': (float(self.env.get("TMDB_CONNECT_TIMEOUT", "3")), float(self.env.get("TMDB_READ_TIMEOUT", "5"))),
+            'books': (float(self.env.get("BOOKS_CONNECT_TIMEOUT", "3")), float(self.env.get("BOOKS_READ_TIMEOUT", "5"))),
+            'itunes': (float(self.env.get("ITUNES_CONNECT_TIMEOUT", "3")), float(self.env.get("ITUNES_READ_TIMEOUT", "5")))
+        }
+
+    # Overall time budget for one recommendation call, after which fallbacks are used
+    REQUEST_DEADLINE = setting("8", float)
+
+    # Connection pool shared by all requests in a process (see api_services.create_session)
+    HTTP_POOL_CONNECTIONS = setting("10", int)  # hosts kept pooled
+    HTTP_POOL_MAXSIZE = setting("32", int)  # keep-alive connections per host
+    HTTP_RETRIES = setting("1", int)  # retries on connect errors and 502/503/504
+
+    # Circuit breaker: open after this many consecutive failures, probe again after the cool-down
+    BREAKER_FAILURE_THRESHOLD = setting("3", int)
+    BREAKER_RESET_TIMEOUT = setting("30", float)
+
+    # On-disk cache of provider responses (see http_cache.py)
+    HTTP_CACHE_ENABLED = setting("True", flag)
+    HTTP_CACHE_DIR = setting(str(Path(__file__).parent / ".http_cache"))
+    TRENDING_CACHE_TTL = setting(str(7 * 24 * 3600), int)  # trending feed changes weekly
+    SEARCH_CACHE_TTL = setting(str(24 * 3600), int)  # book/podcast searches
+
+    # In-memory cache of normalized candidate lists (see candidate_cache.py)
+    CANDIDATE_CACHE_SIZE = setting("256", int)
+
+    # Every pack ever generated, appended to a SQLite store (see history_store.py)
+    HISTORY_DB = setting("history.db")
+    HISTORY_FILE = setting("history.json")  # legacy format, migrated into HISTORY_DB once
+    HISTORY_DEDUP_PACKS = setting("12", int)  # recent packs whose items aren't repeated (see dedup.py)
+
+    # User profile, parsed once and reloaded only when the file changes (see profile_cache.py)
+    USER_DATA_FILE = setting("user_data.json")
+    PROFILE_WATCH_INTERVAL = setting("2", float)  # seconds between checks by the web servers' watcher
+
+    # Local SQLite catalog of every fetched item, with full-text search (see catalog.py)
+    CATALOG_ENABLED = setting("True", flag)
+    CATALOG_PATH = setting(str(Path(__file__).parent / "catalog.db"))
+    CATALOG_FIRST = setting("True", flag)  # answer from the catalog while within the cache TTL
+    SEARCH_MAX_RESULTS = setting("50", int)
+
+    # Background pool of pre-fetched candidates per category (see pool_warmer.py)
+    WARM_POOL_ENABLED = setting("True", flag)
+    WARM_POOL_TARGET = setting("9", int)  # candidates kept per category
+    WARM_POOL_LOW_WATERMARK = setting("3", int)  # top up below this
+    WARM_POOL_INTERVAL = setting("300", float)  # seconds between idle checks
+
+    # Response compression (see compression.py); brotli is used when the package is installed
+    COMPRESSION_ENABLED = setting("True", flag)
+    COMPRESS_MIN_SIZE = setting("1024", int)  # bytes; smaller bodies aren't worth it
+    GZIP_LEVEL = setting("6", int)
+    BROTLI_QUALITY = setting("5", int)  # per-request responses; cached pages use the maximum
+
+    # Largest per-category count accepted by /api/batch
+    BATCH_MAX_COUNT = setting("5", int)
+
+    # Production serving (serve.py, or --production on the start scripts): pre-forking gunicorn workers
+    SERVER_HOST = setting("0.0.0.0")
+    SERVER_PORT = setting("8080", int)
+    SERVER_WORKERS = setting("0", int)  # processes; 0 means 2 x CPUs + 1
+    SERVER_THREADS = setting("4", int)  # request threads per process
+    SERVER_TIMEOUT = setting("60", int)  # seconds a silent worker is allowed before restart
+
+    # Use the asyncio-based service (async_api_services.py) in the web servers
+    ASYNC_SERVICE = setting("False", flag)
 
-# Load environment variables
-load_env_file()
+    # Email settings (optional)
+    EMAIL_ENABLED = setting("False", flag)
+    SMTP_SERVER = "smtp.gmail.com"
+    SMTP_PORT = 587
+    EMAIL_ADDRESS = setting("your_email@gmail.com")
+    EMAIL_PASSWORD = setting("your_app_password")
+    RECIPIENT_EMAIL = setting("swapna@example.com")
 
-# TMDB (The Movie Database) - FREE
-TMDB_API_KEY = os.getenv("TMDB_API_KEY", "test_key")
-TMDB_BASE_URL = "https://api.themoviedb.org/3"
+# Names `from config import *` hands out
+__all__ = [name for name in vars(Settings) if name.isupper()]
 
-# Google Books API - FREE
-GOOGLE_BOOKS_API_KEY = os.getenv("GOOGLE_BOOKS_API_KEY", "test_key")
-GOOGLE_BOOKS_BASE_URL = "https://www.googleapis.com/books/v1"
+_settings = None
+_settings_lock = threading.Lock()
 
-# iTunes Podcasts - FREE (no key needed)
-ITUNES_BASE_URL = "https://itunes.apple.com/search"
+def get_settings():
+    """Process-wide Settings, created on first use"""
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings()
+    return _settings
 
-# Email settings (optional)
-EMAIL_ENABLED = os.getenv("EMAIL_ENABLED", "False").lower() == "true"
-SMTP_SERVER = "smtp.gmail.com"
-SMTP_PORT = 587
-EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS", "your_email@gmail.com")
-EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD", "your_app_password")
-RECIPIENT_EMAIL = os.getenv("RECIPIENT_EMAIL", "swapna@example.com")
\ No newline at end of file
+def __getattr__(name):
+    # config.NAME and `from config import NAME` resolve lazily against the settings
+    if name in __all__:
+        return getattr(get_settings(), name)
+    raise AttributeError(f"module 'config' has no attribute '{name}'")
@@ -24,6 +24,24 @@ def create_package():
         'user_data.md', 
         'api_keys.env',
         'api_services.py',
+        'async_api_services.py',
+        'http_cache.py',
+        'candidate_cache.py',
+        'circuit_breaker.py',
+        'pool_warmer.py',
+        'providers.py',
+        'catalog.py',
+        'dedup.py',
+        'history_store.py',
+        'atomic_io.py',
+        'page_cache.py',
+        'compression.py',
+        'rendering.py',
+        'assets.py',
+        'health.py',
+        'api_routes.py',
+        'profile_cache.py',
+        'serve.py',
         'simple_web.py',
         'start_monthly_pack.py',
         'generate_pack.py',
@@ -43,6 +61,14 @@ def create_package():
         else:
             print(f"⚠️  Missing {file}")
     
+    # Page/email templates and the static CSS/JS used by rendering.py
+    for directory in ['templates', 'static']:
+        if os.path.isdir(directory):
+            shutil.copytree(directory, os.path.join(package_name, directory))
+            print(f"✅ Added {directory}/")
+        else:
+            print(f"⚠️  Missing {directory}/")
+    
     # Create a simple README for the package
     with open(f"{package_name}/START_HERE.md", 'w') as f:
         f.write("""# 🎁 Happy Birthday Swapna!
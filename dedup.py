@@ -0,0 +1,125 @@
+"""
+Monthly Pack Agent - Duplicate Detection
+Normalized title keys and an in-memory index of everything already recommended
+"""
+
+import re
+import threading
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from config import *
+
+ARTICLES = ('the', 'a', 'an')
+TRAILING_ARTICLE = re.compile(r',\s*(the|a|an)\s*$')
+
+# Cached candidates are re-checked on every request, so each distinct title is normalized only once
+@lru_cache(maxsize=16384)
+def normalize_title(text):
+    """Comparison key for a title, so "The Crown", "Crown, The" and "the crown!" collide"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = TRAILING_ARTICLE.sub('', text.strip())
+    # Apostrophes join words ("Schitt's"); any other punctuation separates them
+    text = text.replace("'", '').replace('’', '')
+    words = ''.join(ch if ch.isalnum() else ' ' for ch in text).split()
+    if len(words) > 1 and words[0] in ARTICLES:
+        words = words[1:]
+    return ' '.join(words)
+
+def item_key(item):
+    """Normalized title (movies, books, podcasts) or name (wines, hikes, perfumes) of an item"""
+    return normalize_title(item.get('title') or item.get('name', ''))
+
+def pack_items(value):
+    """A pack entry holds one item, or a list when more than one was requested"""
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, dict)]
+    return [value] if isinstance(value, dict) else []
+
+class HistoryIndex:
+    """Per-category multiset of normalized keys for every item in recent packs.
+
+    Checking a candidate is a single hash lookup. With a history store
+    attached, sync() rebuilds the index whenever a pack has been appended
+    since the last build, so long-running servers see packs the CLI adds;
+    otherwise it costs one MAX(id) query.
+    """
+
+    def __init__(self, store=None):
+        self._keys = {}
+        self._lock = threading.Lock()
+        self.store = store
+        self.latest_id = None
+
+    @classmethod
+    def from_history(cls, history):
+        index = cls()
+        for past_pack in history.get('recommendations', []):
+            index.add_pack(past_pack)
+        return index
+
+    def add_pack(self, pack):
+        """Record every item of a pack ({category: item or [items]})"""
+        with self._lock:
+            for category, value in pack.items():
+                for item in pack_items(value):
+                    self._keys.setdefault(category, Counter())[item_key(item)] += 1
+
+    def sync(self):
+        """Rebuild from the store's recent packs if a pack was appended since the last build"""
+        if self.store is None:
+            return
+        try:
+            latest_id = self.store.latest_id()
+            if latest_id == self.latest_id:
+                return
+            fresh = HistoryIndex.from_history({"recommendations": self.store.recent_packs(HISTORY_DEDUP_PACKS)})
+        except Exception as e:
+            print(f"⚠️ Could not read history: {e}")
+            return
+        with self._lock:
+            self._keys = fresh._keys
+            self.latest_id = latest_id
+
+    def seen(self, category, item):
+        """True when this item was already recommended in this category"""
+        keys = self._keys.get(category)
+        return bool(keys) and item_key(item) in keys
+
+    def prefer_unseen(self, category, items, count=1):
+        """Drop already-recommended items, keeping order.
+
+        When fewer than `count` new items remain, the seen ones are appended
+        after them so the caller still has enough to pick from.
+        """
+        self.sync()
+        unseen = [item for item in items if not self.seen(category, item)]
+        if len(unseen) >= count:
+            return unseen
+        return unseen + [item for item in items if self.seen(category, item)]
+
+    def stats(self):
+        with self._lock:
+            return {category: len(keys) for category, keys in self._keys.items()}
+
+_history_index = None
+_history_lock = threading.Lock()
+
+def get_history_index():
+    """Process-wide index of recent recommendations, kept in step with the history store"""
+    global _history_index
+    if _history_index is None:
+        with _history_lock:
+            if _history_index is None:
+                from history_store import get_history_store
+                try:
+                    store = get_history_store()
+                except Exception as e:
+                    # Recommendations still work, just without skipping past items
+                    print(f"⚠️ Could not read history: {e}")
+                    store = None
+                index = HistoryIndex(store)
+                index.sync()
+                _history_index = index
+    return _history_index
@@ -0,0 +1,46 @@
+"""
+Monthly Pack Agent - Health Probes
+Liveness and readiness endpoints for process managers and load balancers
+"""
+
+import os
+from flask import jsonify
+from config import CATALOG_ENABLED
+
+def readiness_checks():
+    """{'check': passed} for everything a worker needs before it should take traffic"""
+    from assets import get_manifest
+    from catalog import get_catalog
+    from profile_cache import load_user_data
+    from rendering import environment
+
+    checks = {}
+    try:
+        checks['assets'] = bool(get_manifest()[0])
+    except Exception as e:
+        print(f"⚠️ Readiness: assets failed: {e}")
+        checks['assets'] = False
+    try:
+        environment.get_template('interactive.html')
+        checks['templates'] = True
+    except Exception as e:
+        print(f"⚠️ Readiness: templates failed: {e}")
+        checks['templates'] = False
+    # The catalog only adds search, but if it's switched on it should have opened
+    checks['catalog'] = not CATALOG_ENABLED or get_catalog() is not None
+    checks['user_data'] = load_user_data() is not None
+    return checks
+
+def register_health(app):
+    """Add /healthz (the process answers) and /readyz (200 once every readiness check passes, else 503)"""
+    def healthz():
+        return jsonify({'status': 'ok', 'pid': os.getpid()})
+
+    def readyz():
+        checks = readiness_checks()
+        ready = all(checks.values())
+        return jsonify({'ready': ready, 'pid': os.getpid(), 'checks': checks}), 200 if ready else 503
+
+    app.add_url_rule('/healthz', 'healthz', healthz)
+    app.add_url_rule('/readyz', 'readyz', readyz)
+    return app
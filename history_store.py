@@ -0,0 +1,123 @@
+"""
+Monthly Pack Agent - History Store
+Append-only SQLite record of every pack, indexed by month and by category item
+"""
+
+import os
+import json
+import threading
+from config import *
+from dedup import item_key, pack_items
+from sqlite_store import SQLiteStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packs (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    month TEXT NOT NULL,
+    recommendations TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS packs_by_month ON packs (month);
+
+CREATE TABLE IF NOT EXISTS pack_items (
+    pack_id INTEGER NOT NULL REFERENCES packs (id),
+    category TEXT NOT NULL,
+    item_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pack_items_by_item ON pack_items (category, item_key);
+"""
+
+class HistoryStore(SQLiteStore):
+    """Packs are only ever inserted; nothing already written is rewritten or trimmed"""
+
+    SCHEMA = SCHEMA
+
+    def __init__(self, path=None):
+        super().__init__(path or HISTORY_DB)
+
+    def _insert(self, connection, pack):
+        recommendations = {key: value for key, value in pack.items() if key not in ('date', 'month')}
+        cursor = connection.execute(
+            "INSERT INTO packs (date, month, recommendations) VALUES (?, ?, ?)",
+            (pack.get('date', ''), pack.get('month', ''), json.dumps(recommendations)))
+        connection.executemany(
+            "INSERT INTO pack_items (pack_id, category, item_key) VALUES (?, ?, ?)",
+            [(cursor.lastrowid, category, item_key(item))
+             for category, value in recommendations.items() for item in pack_items(value)])
+
+    def append_pack(self, pack):
+        """Append one pack ({'date', 'month', category: item or [items], ...})"""
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                self._insert(connection, pack)
+
+    def _to_pack(self, row):
+        return {'date': row['date'], 'month': row['month'], **json.loads(row['recommendations'])}
+
+    def recent_packs(self, limit=None, offset=0):
+        """Packs newest first, in the same shape history.json used"""
+        rows = self._connection().execute(
+            "SELECT * FROM packs ORDER BY id DESC LIMIT ? OFFSET ?",
+            (limit if limit is not None else -1, offset)).fetchall()
+        return [self._to_pack(row) for row in rows]
+
+    def packs_for_month(self, month):
+        """Packs generated for a month label such as 'October 2025'"""
+        rows = self._connection().execute(
+            "SELECT * FROM packs WHERE month = ? ORDER BY id", (month,)).fetchall()
+        return [self._to_pack(row) for row in rows]
+
+    def months_recommended(self, category, item):
+        """Months in which this item was recommended in this category"""
+        rows = self._connection().execute("""
+            SELECT packs.month FROM pack_items JOIN packs ON packs.id = pack_items.pack_id
+            WHERE pack_items.category = ? AND pack_items.item_key = ?
+            ORDER BY packs.id
+        """, (category, item_key(item))).fetchall()
+        return [row['month'] for row in rows]
+
+    def latest_id(self):
+        """Id of the newest pack (None when empty); changes whenever a pack is appended"""
+        return self._connection().execute("SELECT MAX(id) FROM packs").fetchone()[0]
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM packs").fetchone()[0]
+
+    def migrate_from_json(self, path=None):
+        """One-time import of a legacy history.json, kept as <file>.migrated afterwards"""
+        path = path or HISTORY_FILE
+        if not os.path.exists(path) or self.count():
+            return 0
+
+        try:
+            with open(path, 'r') as f:
+                history = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Could not migrate {path}: {e}")
+            return 0
+
+        # history.json lists the newest pack first; append oldest first
+        packs = list(reversed(history.get('recommendations', [])))
+        with self._write_lock:
+            connection = self._connection()
+            with connection:
+                for pack in packs:
+                    self._insert(connection, pack)
+        os.replace(path, path + '.migrated')
+        print(f"📦 Migrated {len(packs)} packs from {path} to {self.path}")
+        return len(packs)
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_history_store():
+    """Process-wide history store, migrating history.json on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = HistoryStore()
+                store.migrate_from_json()
+                _store = store
+    return _store
@@ -0,0 +1,87 @@
+"""
+Monthly Pack Agent - HTTP Response Cache
+Disk-backed cache of provider JSON responses with per-provider TTLs
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from config import *
+
+# Query params that carry credentials; never part of a cache key
+SECRET_PARAMS = {'api_key', 'key'}
+
+class HTTPCache:
+    def __init__(self, directory=None):
+        self.directory = directory or HTTP_CACHE_DIR
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, url, params):
+        """Stable cache key for a URL plus its params, with API keys stripped"""
+        public_params = sorted((k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS)
+        raw = json.dumps([url, public_params])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, url, params):
+        return os.path.join(self.directory, self.key(url, params) + '.json')
+
+    def get(self, url, params):
+        """Return the cached entry (fresh or stale), or None"""
+        try:
+            with open(self._path(url, params), 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def is_fresh(self, entry, ttl):
+        """True while the entry is younger than ttl seconds"""
+        return time.time() - entry['stored_at'] < ttl
+
+    def revalidation_headers(self, entry):
+        """Conditional request headers for a stale entry, if the upstream gave validators"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, params, body, headers=None):
+        """Save a 200 response body along with its ETag/Last-Modified validators"""
+        headers = headers or {}
+        entry = {
+            'url': url,
+            'stored_at': time.time(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'body': body
+        }
+        self._write(url, params, entry)
+
+    def refresh(self, url, params, entry):
+        """Mark a stale entry fresh again after a 304 Not Modified"""
+        entry['stored_at'] = time.time()
+        self._write(url, params, entry)
+
+    def _write(self, url, params, entry):
+        # The response is already in hand, so a failed cache write is only logged, never raised
+        path = self._path(url, params)
+        try:
+            # A unique temp file per write, so threads storing the same key never share one,
+            # and concurrent readers never see half an entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+        except OSError as e:
+            print(f"⚠️ Could not write HTTP cache entry: {e}")
+            return
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Could not write HTTP cache entry: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,119 @@
+"""
+Monthly Pack Agent - Rendered Page Cache
+Keeps each rendered index page in memory until the pack file behind it changes
+"""
+
+import os
+import json
+import hashlib
+import threading
+from flask import Response, make_response, request
+from compression import CompressedVariants
+
+class RenderedPage:
+    """One rendered page plus the validators sent with it"""
+
+    def __init__(self, html, digest, mtime, signature):
+        self.body = html.encode('utf-8')
+        self.etag = digest[:32]
+        self.last_modified = mtime
+        self.digest = digest
+        self.signature = signature
+        self.compressed = CompressedVariants(self.body)
+
+class PendingPage:
+    """A cache miss: the parsed pack plus the validators its page will carry once rendered"""
+
+    def __init__(self, cache, path, pack, digest, mtime, signature):
+        self.cache = cache
+        self.path = path
+        self.pack = pack
+        self.digest = digest
+        self.etag = digest[:32]
+        self.last_modified = mtime
+        self.signature = signature
+
+    def render(self, render):
+        """Render the whole page at once and cache it"""
+        entry = RenderedPage(render(self.pack), self.digest, self.last_modified, self.signature)
+        return self.cache._store(self.path, entry)
+
+    def stream(self, render_chunks):
+        """Yield the page chunk by chunk, caching it once the last chunk has gone out"""
+        chunks = []
+        for chunk in render_chunks(self.pack):
+            chunks.append(chunk)
+            yield chunk
+        self.cache._store(self.path, RenderedPage(''.join(chunks), self.digest, self.last_modified, self.signature))
+
+class PageCache:
+    """Rendered pages keyed on the source file's (mtime, size), confirmed by content hash.
+
+    A warm hit costs one os.stat and a dict lookup. If the file was touched but
+    its bytes are unchanged, the hash matches and the page isn't re-rendered.
+    """
+
+    def __init__(self, version=''):
+        # Folded into every ETag, e.g. rendering.page_version(): the app, its templates and asset fingerprints
+        self.version = version.encode()
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.renders = 0
+
+    def lookup(self, path):
+        """RenderedPage on a hit, else a PendingPage to render or stream; raises FileNotFoundError like open()"""
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is not None and entry.signature == signature:
+            self.hits += 1
+            return entry
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw + self.version).hexdigest()
+        if entry is not None and entry.digest == digest:
+            entry.signature = signature
+            self.hits += 1
+            return entry
+
+        return PendingPage(self, path, json.loads(raw), digest, stat.st_mtime, signature)
+
+    def get(self, path, render):
+        """Rendered page for the JSON file at `path`, rendering it on a miss"""
+        page = self.lookup(path)
+        if isinstance(page, PendingPage):
+            page = page.render(render)
+        return page
+
+    def _store(self, path, entry):
+        with self._lock:
+            self._entries[path] = entry
+            self.renders += 1
+        return entry
+
+    def stats(self):
+        return {'pages': len(self._entries), 'hits': self.hits, 'renders': self.renders}
+
+def page_response(page, render_chunks=None):
+    """HTML response with ETag/Last-Modified, or 304 Not Modified for a matching conditional GET.
+
+    A cached page is sent whole, with pre-compressed variants. A PendingPage is
+    streamed through render_chunks(pack) and cached as it goes; streamed
+    responses are not compressed.
+    """
+    if isinstance(page, PendingPage):
+        # The generator only starts once the server iterates it, so a 304 never renders anything
+        response = Response(page.stream(render_chunks), mimetype='text/html')
+        # Otherwise make_conditional drains the generator to work out a Content-Length
+        response.implicit_sequence_conversion = False
+    else:
+        response = make_response(page.body)
+        response.content_type = 'text/html; charset=utf-8'
+        response.compressed_variant = page.compressed
+    response.set_etag(page.etag)
+    response.last_modified = page.last_modified
+    # Let browsers keep the page but check back every time, which is a cheap 304
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
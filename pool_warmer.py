@@ -0,0 +1,94 @@
+"""
+Monthly Pack Agent - Candidate Pool Warmer
+Keeps a pre-fetched pool of recommendations per category so refresh clicks never wait on providers
+"""
+
+import threading
+from collections import deque
+from config import *
+from dedup import item_key
+
+class CandidateWarmer:
+    """Background thread that tops up per-category candidate pools.
+
+    fetch(category, count) must return up to `count` ranked items for the
+    category, and raise rather than return curated fallbacks, which would
+    otherwise be served from the pool after the provider recovers (see
+    get_recommendations(live_only=True)). Pools are refilled to `target`
+    whenever they drop below `low_watermark`; take() never blocks on a provider.
+    """
+
+    def __init__(self, fetch, categories, target=None, low_watermark=None):
+        self.fetch = fetch
+        self.target = target or WARM_POOL_TARGET
+        self.low_watermark = low_watermark or WARM_POOL_LOW_WATERMARK
+        self.pools = {category: deque() for category in categories}
+        self.served = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the warmer thread (idempotent); the first pass fills every pool"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='candidate-warmer', daemon=True)
+            self._thread.start()
+            self._wakeup.set()
+        return self
+
+    def take(self, category, count=1):
+        """Pop `count` candidates in O(1), or return None so the caller fetches live"""
+        pool = self.pools.get(category)
+        if pool is None:
+            return None
+
+        with self._lock:
+            if len(pool) < count:
+                self.misses += 1
+                items = None
+            else:
+                self.served += 1
+                items = [pool.popleft() for _ in range(count)]
+            running_low = len(pool) < self.low_watermark
+
+        if running_low:
+            self._wakeup.set()
+        return items
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(WARM_POOL_INTERVAL)
+            self._wakeup.clear()
+            for category in self.pools:
+                if len(self.pools[category]) < self.low_watermark:
+                    self._top_up(category)
+
+    def _top_up(self, category):
+        try:
+            items = self.fetch(category, self.target)
+        except Exception as e:
+            print(f"❌ Error warming {category}: {e}")
+            return
+        if not isinstance(items, list):
+            items = [items]
+
+        pool = self.pools[category]
+        with self._lock:
+            pooled = {item_key(item) for item in pool}
+            for item in items:
+                if len(pool) >= self.target:
+                    break
+                if item_key(item) not in pooled:
+                    pool.append(item)
+                    pooled.add(item_key(item))
+
+    def stats(self):
+        """Pool sizes and hit counters for the /api/stats endpoint"""
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'sizes': {category: len(pool) for category, pool in self.pools.items()},
+                'served': self.served,
+                'misses': self.misses
+            }
@@ -0,0 +1,124 @@
+"""
+Monthly Pack Agent - User Profile Cache
+Parses user_data.json once per change and hands every caller the same read-only profile
+"""
+
+import os
+import json
+import hashlib
+import threading
+import config
+from types import MappingProxyType
+
+def freeze(value):
+    """Read-only copy of parsed JSON: dicts become mappingproxies and lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+class ProfileCache:
+    """The parsed profile, reloaded only when the file's (mtime, size) changes and its content hash differs.
+
+    Without the watcher, get() costs one stat() per call. With the watcher
+    running, get() does no file I/O at all; the watcher thread polls the
+    file every `interval` seconds and swaps in the new profile.
+    """
+
+    def __init__(self, path=None, interval=None):
+        self.path = path or config.USER_DATA_FILE
+        self.interval = interval or config.PROFILE_WATCH_INTERVAL
+        self._profile = None
+        self._signature = None
+        self._digest = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.loads = 0
+        self.hits = 0
+
+    def get(self):
+        """The current profile (read-only), or None when the file is missing or was never valid"""
+        if self.watching and self._profile is not None:
+            self.hits += 1
+            return self._profile
+        return self.refresh()
+
+    def refresh(self):
+        """Check the file and reload it if its content changed"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            print(f"❌ {self.path} not found")
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            self.hits += 1
+            return self._profile
+
+        with self._lock:
+            if signature == self._signature:
+                return self._profile
+            try:
+                with open(self.path, 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                print(f"❌ {self.path} not found")
+                return None
+            digest = hashlib.sha256(raw).hexdigest()
+            if digest != self._digest:
+                try:
+                    profile = freeze(json.loads(raw))
+                except json.JSONDecodeError:
+                    # Possibly caught mid-edit; leave the signature unset so the next call retries
+                    print(f"❌ Invalid JSON in {self.path}" + (", keeping the last good profile" if self._profile else ""))
+                    return self._profile
+                self._profile = profile
+                self._digest = digest
+                self.loads += 1
+            self._signature = signature
+        return self._profile
+
+    @property
+    def watching(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start_watcher(self):
+        """Start the polling thread (idempotent) so get() stops touching the file"""
+        if not self.watching:
+            self.refresh()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name='profile-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Profile watcher error: {e}")
+
+    def stats(self):
+        return {'loads': self.loads, 'hits': self.hits, 'watching': self.watching}
+
+_profile_cache = None
+_profile_cache_lock = threading.Lock()
+
+def get_profile_cache():
+    """Process-wide profile cache for USER_DATA_FILE"""
+    global _profile_cache
+    if _profile_cache is None:
+        with _profile_cache_lock:
+            if _profile_cache is None:
+                _profile_cache = ProfileCache()
+    return _profile_cache
+
+def load_user_data():
+    """The user's preferences from user_data.json (read-only), or None if it's missing or invalid"""
+    return get_profile_cache().get()
@@ -0,0 +1,203 @@
+"""
+Monthly Pack Agent - Category Provider Registry
+One place that maps each pack category to its provider, user_data key, renderer and cache policy
+"""
+
+import time
+import config
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+class CategoryProvider:
+    """Everything the entry points need to know about one pack category"""
+
+    def __init__(self, category, title, method, prefs_key, progress, renderer, cache_policy):
+        self.category = category
+        self.title = title                # card heading
+        self.method = method              # RecommendationService method name
+        self.prefs_key = prefs_key        # section of user_data.json passed to the method
+        self.progress = progress          # CLI progress message
+        self.renderer = renderer          # card layout used by the HTML/email renderers
+        self.cache_policy = cache_policy  # 'trending', 'search' or 'static' (curated list)
+
+    @property
+    def is_static(self):
+        """Curated lists are local and instant; there is nothing to cache or warm"""
+        return self.cache_policy == 'static'
+
+    def cache_ttl(self):
+        """Seconds a fetched result for this category stays valid, in the response, candidate and catalog caches"""
+        return {'trending': config.TRENDING_CACHE_TTL, 'search': config.SEARCH_CACHE_TTL}.get(self.cache_policy, 0)
+
+    def fetch(self, user_data, count=1, service=None, live_only=False):
+        """Call the provider for this category with the right slice of user_data.
+
+        With live_only, a failed provider raises ProviderUnavailable instead of
+        answering with its curated fallbacks (curated categories always answer).
+        """
+        service = service or get_service()
+        options = {'live_only': True} if live_only and not self.is_static else {}
+        return getattr(service, self.method)(user_data.get(self.prefs_key, {}), count, **options)
+
+# Insertion order is the display order used by every renderer
+PROVIDERS = {
+    'entertainment': CategoryProvider('entertainment', "📺 Entertainment", 'get_movie_recommendations', 'tvMovies',
+                                      "📺 Getting movie/TV recommendation...", 'entertainment', 'trending'),
+    'book': CategoryProvider('book', "📚 Book", 'get_book_recommendations', 'books',
+                             "📚 Getting book recommendation...", 'book', 'search'),
+    'podcast': CategoryProvider('podcast', "🎧 Podcast", 'get_podcast_recommendations', 'podcasts',
+                                "🎧 Getting podcast recommendation...", 'podcast', 'search'),
+    'wine': CategoryProvider('wine', "🍷 Wine", 'get_wine_recommendations', 'wine',
+                             "🍷 Getting wine recommendation...", 'wine', 'static'),
+    'hiking': CategoryProvider('hiking', "🥾 Hiking", 'get_hiking_recommendations', 'hiking',
+                               "🥾 Getting hiking recommendation...", 'hiking', 'static'),
+    'perfume': CategoryProvider('perfume', "🌸 Perfume", 'get_perfume_recommendations', 'perfume',
+                                "🌸 Getting perfume recommendation...", 'perfume', 'static')
+}
+
+CATEGORIES = list(PROVIDERS)
+
+def get_provider(category):
+    """O(1) lookup; None for an unknown category"""
+    return PROVIDERS.get(category)
+
+# The provider modules (requests, aiohttp) are only imported when a service is first needed
+_service = None
+_service_lock = threading.Lock()
+
+def get_service():
+    """Process-wide recommendation service, so every caller shares one connection pool"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                if config.ASYNC_SERVICE:
+                    module = importlib.import_module('async_api_services')
+                    _service = module.BlockingRecommendationService()
+                else:
+                    module = importlib.import_module('api_services')
+                    _service = module.RecommendationService()
+    return _service
+
+def get_recommendations(category, user_data, count=1, service=None, live_only=False):
+    """Recommendations for one category, or None for an unknown category"""
+    provider = get_provider(category)
+    if provider is None:
+        return None
+    return provider.fetch(user_data, count, service, live_only)
+
+def fetch_category(category, user_data, count=1, service=None):
+    """Fetch one category and return (recommendation, seconds taken)"""
+    started = time.perf_counter()
+    recommendation = get_recommendations(category, user_data, count, service)
+    return recommendation, round(time.perf_counter() - started, 3)
+
+def fetch_categories(user_data, count=1, service=None, parallel=False, max_workers=None,
+                     categories=None, verbose=False):
+    """Fetch several categories, serially or concurrently on a bounded thread pool.
+
+    Returns (recommendations, timings) in registry order regardless of completion order.
+    """
+    categories = categories or CATEGORIES
+    service = service or get_service()
+    results = {}
+
+    if not parallel:
+        for category in categories:
+            if verbose:
+                print(PROVIDERS[category].progress)
+            results[category] = fetch_category(category, user_data, count, service)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers or len(categories)) as executor:
+            futures = {}
+            for category in categories:
+                if verbose:
+                    print(PROVIDERS[category].progress)
+                futures[executor.submit(fetch_category, category, user_data, count, service)] = category
+            for future in as_completed(futures):
+                category = futures[future]
+                results[category] = future.result()
+                if verbose:
+                    print(f"   ✓ {category} ready in {results[category][1]}s")
+
+    recommendations = {category: results[category][0] for category in categories}
+    timings = {category: results[category][1] for category in categories}
+    return recommendations, timings
+
+def iter_batch(categories, user_data, count=1, take=None, max_workers=None):
+    """Yield (category, result) for several categories as each one resolves.
+
+    Warm-pool hits come out first, then live fetches in completion order, so
+    a caller can pass each result on as soon as its provider answers.
+    Results are {'success': True, 'recommendations': ...} or
+    {'success': False, 'error': ...}; duplicate categories are resolved once.
+    """
+    pending = []
+    for category in dict.fromkeys(categories):
+        if get_provider(category) is None:
+            yield category, {'success': False, 'error': 'Invalid category'}
+            continue
+        items = take(category, count) if take else None
+        if items:
+            yield category, {'success': True, 'recommendations': items if count > 1 else items[0]}
+        else:
+            pending.append(category)
+
+    if not pending:
+        return
+
+    service = get_service()
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(pending))
+    try:
+        futures = {executor.submit(get_recommendations, category, user_data, count, service): category
+                   for category in pending}
+        for future in as_completed(futures):
+            category = futures[future]
+            try:
+                yield category, {'success': True, 'recommendations': future.result()}
+            except Exception as e:
+                print(f"❌ Error getting {category}: {e}")
+                yield category, {'success': False, 'error': str(e)}
+    finally:
+        # A streaming client may disconnect early; don't hold its request open for stragglers
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def fetch_batch(categories, user_data, count=1, take=None, max_workers=None):
+    """Resolve several categories for one request, each with its own status.
+
+    take(category, count) may serve candidates from a warm pool; whatever it
+    can't cover is fetched concurrently with the shared service.
+    Returns {category: {'success': True, 'recommendations': ...}} or
+    {category: {'success': False, 'error': ...}} per requested category.
+    """
+    results = dict(iter_batch(categories, user_data, count, take, max_workers))
+    # Answer in the order the categories were asked for
+    return {category: results[category] for category in categories if category in results}
+
+def fetch_categories_async(user_data, count=1, categories=None, verbose=False):
+    """Fetch several categories concurrently on one asyncio event loop"""
+    import asyncio
+    from async_api_services import AsyncRecommendationService
+
+    categories = categories or CATEGORIES
+
+    async def fetch_all():
+        async with AsyncRecommendationService() as service:
+            async def timed(category):
+                started = time.perf_counter()
+                recommendation = await PROVIDERS[category].fetch(user_data, count, service)
+                seconds = round(time.perf_counter() - started, 3)
+                if verbose:
+                    print(f"   ✓ {category} ready in {seconds}s")
+                return recommendation, seconds
+
+            if verbose:
+                for category in categories:
+                    print(PROVIDERS[category].progress)
+            return await asyncio.gather(*(timed(category) for category in categories))
+
+    results = dict(zip(categories, asyncio.run(fetch_all())))
+    recommendations = {category: results[category][0] for category in categories}
+    timings = {category: results[category][1] for category in categories}
+    return recommendations, timings
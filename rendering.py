@@ -0,0 +1,89 @@
+"""
+Monthly Pack Agent - Rendering
+One Jinja2 environment, compiled once per process, used by every HTML and email renderer
+"""
+
+import hashlib
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+from assets import STATIC_DIR, asset_url, asset_version
+from dedup import pack_items
+from providers import PROVIDERS, get_provider
+
+TEMPLATE_DIR = Path(__file__).parent / 'templates'
+
+# Templates don't change while the process runs, so skip the per-render
+# freshness check and keep every compiled template in memory
+environment = Environment(
+    # static/ is searchable too, so the file-based page can inline the same CSS the web pages link
+    loader=FileSystemLoader([str(TEMPLATE_DIR), str(STATIC_DIR)]),
+    autoescape=select_autoescape(['html']),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+    cache_size=-1
+)
+environment.globals['asset_url'] = asset_url
+
+# Where base.html's cards end; stream_page splits the page shell here
+CARDS_SLOT = Markup('<!--cards-->')
+
+def render(name, **context):
+    """Render a template by name; the first call compiles it, later calls only fill it"""
+    return environment.get_template(name).render(**context)
+
+def compile_templates():
+    """Compile every HTML/text template up front, e.g. before serve.py forks its workers"""
+    for name in environment.list_templates(extensions=['html', 'txt']):
+        environment.get_template(name)
+
+@lru_cache(maxsize=None)
+def template_version():
+    """Fingerprint of every template's source; templates are fixed for the life of the process"""
+    digest = hashlib.sha256()
+    for name in environment.list_templates():
+        digest.update(name.encode())
+        digest.update(environment.loader.get_source(environment, name)[0].encode())
+    return digest.hexdigest()[:12]
+
+def page_version(app_name):
+    """Folded into a page cache's ETags: which app rendered the page, with which templates and assets"""
+    return f"{app_name}:{template_version()}:{asset_version()}"
+
+def pack_cards(recommendations):
+    """(provider, [items]) pairs in display order, whether a category holds one item or several"""
+    return [(provider, pack_items(recommendations.get(provider.category, {}))) for provider in PROVIDERS.values()]
+
+def render_page(template, pack, **context):
+    """A full pack page: 'pack.html' (static file) or 'interactive.html' (web servers)"""
+    return render(template, pack=pack, cards=pack_cards(pack['recommendations']),
+                  generated_on=datetime.now().strftime('%B %d, %Y at %I:%M %p'), **context)
+
+def stream_page(template, pack, cards, buttons=False, live=False, **context):
+    """Yield a pack page in pieces: everything before the cards, each card as `cards` produces it, then the rest.
+
+    `cards` yields (provider, items) pairs and may be slow (e.g. live provider
+    fetches). With live=True cards may arrive in any order; each one is pinned
+    to its registry position so the grid still shows them in the usual order.
+    """
+    shell = render(template, pack=pack, cards=[], cards_slot=CARDS_SLOT,
+                   generated_on=datetime.now().strftime('%B %d, %Y at %I:%M %p'), **context)
+    head, _, tail = shell.partition(CARDS_SLOT)
+    yield head
+    positions = {category: position for position, category in enumerate(PROVIDERS)}
+    for provider, items in cards:
+        yield render('card.html', provider=provider, items=items, buttons=buttons,
+                     order=positions.get(provider.category) if live else None)
+    yield tail
+
+def render_card_body(category, recommendations):
+    """Inner card markup for one category, returned by the refresh APIs so the page JS only swaps HTML"""
+    return render('card_body.html', provider=get_provider(category), items=pack_items(recommendations))
+
+def render_email(pack):
+    """(html, text) bodies for the monthly pack email"""
+    cards = pack_cards(pack['recommendations'])
+    return render('email.html', pack=pack, cards=cards), render('email.txt', pack=pack, cards=cards)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Monthly Pack Agent - Production Server
+Runs simple_web.py or web_server.py under gunicorn: pre-forked worker processes, each with a pool of request threads
+"""
+
+import sys
+import argparse
+import importlib
+import multiprocessing
+from config import SERVER_HOST, SERVER_PORT, SERVER_WORKERS, SERVER_THREADS, SERVER_TIMEOUT
+
+# Each app and the function that streams its index page
+APPS = {'simple_web': 'stream_html_page', 'web_server': 'stream_interactive_html'}
+
+def default_workers():
+    """gunicorn's usual 2 x CPUs + 1"""
+    return multiprocessing.cpu_count() * 2 + 1
+
+def preload(module, render_chunks):
+    """Build shared state once in the master, so every forked worker inherits it copy-on-write"""
+    from api_routes import preload_page
+    from assets import get_manifest
+    from catalog import get_catalog
+    from dedup import get_history_index
+    from history_store import get_history_store
+    from profile_cache import get_profile_cache
+    from rendering import compile_templates
+
+    get_manifest()
+    compile_templates()
+    get_profile_cache().get()
+    get_history_index()
+    catalog = get_catalog()
+    preload_page(module.page_cache, render_chunks)
+
+    # SQLite connections must not cross a fork; each worker thread opens its own
+    try:
+        if catalog:
+            catalog.close()
+        get_history_store().close()
+    except Exception as e:
+        print(f"⚠️ Could not close database connections before forking: {e}")
+
+def create_server(app_name='simple_web', bind=None, workers=None, threads=None):
+    """gunicorn application serving `app_name`'s Flask app; raises ImportError when gunicorn isn't installed"""
+    from gunicorn.app.base import BaseApplication
+
+    class MonthlyPackServer(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            self.module = None
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # With preload_app this runs once, in the master, before any worker forks
+            if self.module is None:
+                self.module = importlib.import_module(app_name)
+                preload(self.module, getattr(self.module, APPS[app_name]))
+            return self.module.app
+
+    def post_fork(server, worker):
+        # Background threads (the candidate warmer) don't survive fork; start them per worker
+        from api_routes import start_background
+        start_background(importlib.import_module(app_name).warmer)
+
+    return MonthlyPackServer({
+        'bind': bind or f"{SERVER_HOST}:{SERVER_PORT}",
+        'workers': workers or SERVER_WORKERS or default_workers(),
+        'threads': threads or SERVER_THREADS,
+        'worker_class': 'gthread',
+        'timeout': SERVER_TIMEOUT,
+        'preload_app': True,
+        'post_fork': post_fork,
+        'accesslog': '-'
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the Monthly Pack web interface with multiple worker processes')
+    parser.add_argument('--app', choices=APPS, default='simple_web', help='which web interface to serve')
+    parser.add_argument('--bind', help=f"host:port (default {SERVER_HOST}:{SERVER_PORT})")
+    parser.add_argument('--workers', type=int, help='worker processes (default SERVER_WORKERS, or 2 x CPUs + 1)')
+    parser.add_argument('--threads', type=int, help=f"request threads per worker (default {SERVER_THREADS})")
+    args = parser.parse_args()
+
+    try:
+        server = create_server(args.app, args.bind, args.workers, args.threads)
+    except ImportError:
+        print("❌ Production mode needs gunicorn (Linux/macOS). Please run: pip install gunicorn")
+        sys.exit(1)
+
+    print(f"🚀 Serving {args.app} with {server.options['workers']} workers x {server.options['threads']} threads "
+          f"on {server.options['bind']}")
+    print("🩺 Liveness: /healthz   Readiness: /readyz")
+    server.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Monthly Pack Agent - SQLite Store
+Per-thread WAL connections shared by the catalog and the history store
+"""
+
+import sqlite3
+import threading
+
+class SQLiteStore:
+    """One connection per thread; WAL lets readers run while a writer commits.
+
+    Subclasses set SCHEMA, applied once on open, and any extra PRAGMAS run on
+    every new connection. Writers take _write_lock.
+    """
+
+    SCHEMA = ''
+    PRAGMAS = ()
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock:
+            connection = self._connection()
+            connection.executescript(self.SCHEMA)
+            connection.commit()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            for pragma in self.PRAGMAS:
+                connection.execute(f'PRAGMA {pragma}')
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        """Close this thread's connection, e.g. before forking; the next query opens a new one"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Monthly Pack Agent - Provider Stand-in Server
+Local fake of the TMDB, Google Books and iTunes endpoints for offline benchmarking.
+
+Serves synthetic payloads, or replays responses recorded from the real
+providers (--record) out of a fixtures directory, with configurable latency,
+jitter, injected errors and payload sizes.
+"""
+
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from collections import Counter, defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, urlencode
+from atomic_io import atomic_write_json
+
+# Route prefix on this server -> the real endpoint it stands in for (used by --record)
+UPSTREAMS = {
+    'tmdb': ('/tmdb/3', 'https://api.themoviedb.org/3'),
+    'books': ('/books/v1', 'https://www.googleapis.com/books/v1'),
+    'itunes': ('/itunes/search', 'https://itunes.apple.com/search')
+}
+
+# Endpoints with a built-in synthetic payload, for when nothing was recorded
+SYNTHETIC_PATHS = {'tmdb': ('/trending/all/week',), 'books': ('/volumes',), 'itunes': ('',)}
+
+# Never written to fixture files, and ignored when matching a request to a fixture
+SECRET_PARAMS = ('api_key', 'key')
+
+DEFAULT_FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+def trending_payload():
+    """Fake TMDB /trending/all/week response"""
+    results = []
+    for i in range(40):
+        media_type = 'movie' if i % 2 == 0 else 'tv'
+        title_key = 'title' if media_type == 'movie' else 'name'
+        results.append({
+            'media_type': media_type,
+            title_key: f"Stand-in {media_type.title()} {i}",
+            'overview': f"A character-driven story number {i}",
+            'vote_average': round(5 + (i * 7 % 50) / 10, 1),
+            'genre_ids': [18, 35] if i % 3 else [28],
+            'poster_path': f"/poster{i}.jpg"
+        })
+    return {'results': results}
+
+def books_payload(query):
+    """Fake Google Books /volumes response"""
+    items = []
+    for i in range(15):
+        items.append({
+            'volumeInfo': {
+                'title': f"{query.title()} Book {i}",
+                'authors': [f"Author {i}"],
+                'description': f"A book about {query}. " * 20,
+                'averageRating': 3.5 + (i % 4) / 2,
+                'imageLinks': {'thumbnail': f"http://books.example/{i}.jpg"},
+                'previewLink': f"http://books.example/{i}"
+            }
+        })
+    return {'items': items}
+
+def podcasts_payload(term):
+    """Fake iTunes search response"""
+    results = []
+    for i in range(15):
+        results.append({
+            'collectionName': f"{term.title()} Podcast {i}",
+            'artistName': f"Host {i}",
+            'description': f"Conversations about {term}. " * 10,
+            'artworkUrl600': f"http://itunes.example/{i}.jpg",
+            'collectionViewUrl': f"http://itunes.example/{i}"
+        })
+    return {'results': results}
+
+def synthetic_payload(provider, query):
+    """Canned response for a provider when there is no recorded one"""
+    if provider == 'tmdb':
+        return trending_payload()
+    if provider == 'books':
+        return books_payload(query.get('q', ''))
+    return podcasts_payload(query.get('term', ''))
+
+def resize_payload(payload, scale):
+    """Grow or shrink the result list ('results' or 'items') by `scale`, repeating entries as needed"""
+    if scale == 1 or not isinstance(payload, dict):
+        return payload
+    for key in ('results', 'items'):
+        items = payload.get(key)
+        if isinstance(items, list) and items:
+            size = max(0, round(len(items) * scale))
+            return {**payload, key: [items[i % len(items)] for i in range(size)]}
+    return payload
+
+class FixtureStore:
+    """Recorded provider responses, one JSON file per distinct request under <directory>/<provider>/"""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or DEFAULT_FIXTURES_DIR)
+        self._by_key = {}
+        self._by_route = defaultdict(list)
+        self._lock = threading.Lock()
+        for path in sorted(self.directory.glob('*/*.json')):
+            try:
+                with open(path, 'r') as f:
+                    self._add(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Skipping fixture {path}: {e}")
+
+    @staticmethod
+    def key(provider, path, query):
+        """Provider, path and query string with secrets dropped and parameters sorted"""
+        params = sorted((name, value) for name, value in query.items() if name not in SECRET_PARAMS)
+        return f"{provider}{path}?{urlencode(params)}"
+
+    def _add(self, fixture):
+        key = self.key(fixture['provider'], fixture['path'], fixture['query'])
+        with self._lock:
+            if key not in self._by_key:
+                self._by_route[(fixture['provider'], fixture['path'])].append(fixture)
+            self._by_key[key] = fixture
+
+    def lookup(self, provider, path, query):
+        """The fixture recorded for this exact request, else a stable pick among the same endpoint's, else None"""
+        key = self.key(provider, path, query)
+        fixture = self._by_key.get(key)
+        if fixture is None:
+            candidates = self._by_route.get((provider, path))
+            if candidates:
+                # e.g. a search term that was never recorded gets another term's results, always the same one
+                fixture = candidates[int(hashlib.sha1(key.encode()).hexdigest(), 16) % len(candidates)]
+        return fixture
+
+    def save(self, provider, path, query, status, body):
+        """Write one recorded response; API keys are stripped from the stored query"""
+        fixture = {
+            'provider': provider,
+            'path': path,
+            'query': {name: value for name, value in query.items() if name not in SECRET_PARAMS},
+            'status': status,
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'body': body
+        }
+        key = self.key(provider, path, query)
+        filename = self.directory / provider / f"{hashlib.sha1(key.encode()).hexdigest()[:16]}.json"
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(str(filename), fixture)
+        self._add(fixture)
+        return fixture
+
+    def __len__(self):
+        return len(self._by_key)
+
+def fetch_upstream(provider, path, query, timeout=15):
+    """(status, parsed JSON body) from the real provider"""
+    url = UPSTREAMS[provider][1] + path
+    if query:
+        url += '?' + urlencode(query)
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        try:
+            return e.code, json.loads(e.read())
+        except ValueError:
+            return e.code, {'error': e.reason}
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Routes /tmdb/..., /books/... and /itunes/... to canned payloads"""
+
+    # Keep-alive, like the real providers, so connection reuse can be measured
+    protocol_version = 'HTTP/1.1'
+
+    def route(self, url):
+        """(provider, path below the provider's base URL) or (None, None)"""
+        for provider, (prefix, _) in UPSTREAMS.items():
+            if url.path == prefix or url.path.startswith(prefix + '/'):
+                return provider, url.path[len(prefix):]
+        return None, None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        provider, path = self.route(url)
+        if provider is None:
+            self.send_error(404)
+            return
+
+        server = self.server
+        if server.record:
+            # Pass through to the real provider and keep what it said
+            server.counts[provider] += 1
+            try:
+                status, payload = fetch_upstream(provider, path, query)
+            except Exception as e:
+                print(f"❌ Recording {provider}{path} failed: {e}")
+                self.send_json(502, {'error': str(e)})
+                return
+            server.fixtures.save(provider, path, query, status, payload)
+            self.send_json(status, payload)
+            return
+
+        fixture = server.fixtures.lookup(provider, path, query) if server.fixtures else None
+        if fixture is not None:
+            status, payload = fixture['status'], fixture['body']
+        elif path in SYNTHETIC_PATHS[provider]:
+            status, payload = 200, synthetic_payload(provider, query)
+        else:
+            self.send_error(404)
+            return
+
+        server.counts[provider] += 1
+        time.sleep(max(0.0, server.latency.get(provider, 0.0) + server.rng.uniform(0, server.jitter)))
+
+        if server.error_rate and server.rng.random() < server.error_rate:
+            server.counts['errors'] += 1
+            self.send_json(server.error_status, {'error': 'stand-in injected failure'})
+            return
+
+        self.send_json(status, resize_payload(payload, server.payload_scale))
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        try:
+            self.send_response(status)
+            if status == 200:
+                self.send_header('ETag', etag)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (e.g. hit its timeout) before the slow response arrived
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+def start_standin_server(host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                         payload_scale=1.0, fixtures=None, record=False, seed=None):
+    """Start the stand-in server on a background thread.
+
+    latency is seconds per response, either one number or a dict keyed by
+    'tmdb', 'books' and 'itunes'; each response waits up to `jitter` more.
+    A share `error_rate` of responses fail with `error_status`.
+    payload_scale resizes every result list (2 doubles it, 0.5 halves it).
+    fixtures is a directory (or FixtureStore) of recorded responses to
+    replay; with record=True requests are forwarded to the real providers
+    and saved there instead. seed makes jitter and errors repeatable.
+    """
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    if isinstance(latency, dict):
+        server.latency = latency
+    else:
+        server.latency = {'tmdb': latency, 'books': latency, 'itunes': latency}
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.error_status = error_status
+    server.payload_scale = payload_scale
+    server.record = record
+    if isinstance(fixtures, FixtureStore):
+        server.fixtures = fixtures
+    elif fixtures is not None or record:
+        server.fixtures = FixtureStore(fixtures)
+    else:
+        server.fixtures = None
+    server.rng = random.Random(seed)
+    server.counts = Counter()
+
+    thread = threading.Thread(target=server.serve_forever, name='standin-server', daemon=True)
+    thread.start()
+    return server
+
+def parse_latency(value):
+    """'0.2' for every provider, or per provider: 'tmdb=0.2,books=0.8,itunes=1.5'"""
+    if '=' not in value:
+        return float(value)
+    latency = {'tmdb': 0.0, 'books': 0.0, 'itunes': 0.0}
+    for pair in value.split(','):
+        provider, seconds = pair.split('=', 1)
+        if provider.strip() not in latency:
+            raise argparse.ArgumentTypeError(f"unknown provider '{provider.strip()}'")
+        latency[provider.strip()] = float(seconds)
+    return latency
+
+def standin_env(server):
+    """Environment variables that point config.py at a running stand-in server"""
+    host, port = server.server_address[:2]
+    base = f"http://{host}:{port}"
+    return {
+        'TMDB_BASE_URL': f"{base}/tmdb/3",
+        'GOOGLE_BOOKS_BASE_URL': f"{base}/books/v1",
+        'ITUNES_BASE_URL': f"{base}/itunes/search"
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Local stand-in for the TMDB, Google Books and iTunes APIs')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=parse_latency, default=0.0,
+                       help="Seconds to wait before every response, or per provider: tmdb=0.2,books=0.8 (default: 0)")
+    parser.add_argument('--jitter', type=float, default=0.0,
+                       help='Up to this many extra seconds per response, at random (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                       help='Share of responses that fail, e.g. 0.05 (default: 0)')
+    parser.add_argument('--error-status', type=int, default=503,
+                       help='HTTP status of injected failures (default: 503)')
+    parser.add_argument('--payload-scale', type=float, default=1.0,
+                       help='Multiply the number of results per response (default: 1)')
+    parser.add_argument('--fixtures', nargs='?', const=str(DEFAULT_FIXTURES_DIR), default=None,
+                       help=f"Replay recorded responses from this directory (default when given: {DEFAULT_FIXTURES_DIR})")
+    parser.add_argument('--record', action='store_true',
+                       help='Forward requests to the real providers and save the responses as fixtures')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Random seed for repeatable jitter and errors')
+
+    args = parser.parse_args()
+    server = start_standin_server(args.host, args.port, args.latency, args.jitter, args.error_rate,
+                                  args.error_status, args.payload_scale, args.fixtures, args.record, args.seed)
+
+    if args.record:
+        print(f"🎙️ Recording provider responses into {server.fixtures.directory} via http://{args.host}:{args.port}")
+        print("💡 Run the agent against it with real API keys in api_keys.env, e.g. python generate_pack.py")
+    else:
+        source = f"{len(server.fixtures)} recorded responses" if server.fixtures else "synthetic payloads"
+        print(f"🧪 Provider stand-in running on http://{args.host}:{args.port} ({source})")
+    print("💡 Point the agent at it with:")
+    for key, value in standin_env(server).items():
+        print(f"   export {key}={value}")
+    print("\n🛑 Press Ctrl+C to stop")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
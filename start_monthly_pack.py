@@ -4,6 +4,7 @@ Monthly Pack Agent - Simple Launcher
 Easy way to start the interactive monthly pack
 """
 
+import argparse
 import subprocess
 import webbrowser
 import time
@@ -61,7 +62,7 @@ def install_requirements():
             print("❌ Failed to install Flask. Please run: pip install flask")
             return False
 
-def start_server():
+def start_server(production=False):
     """Start the web server"""
     print("🌐 Starting Monthly Pack Web Interface...")
     print("📂 Opening browser to: http://localhost:8080")
@@ -81,13 +82,16 @@ def start_server():
     browser_thread.daemon = True
     browser_thread.start()
     
-    # Start the server
+    # Start the server: Flask's development server, or gunicorn workers in production mode
     try:
-        subprocess.run([sys.executable, 'simple_web.py'])
+        if production:
+            subprocess.run([sys.executable, 'serve.py', '--app', 'simple_web'])
+        else:
+            subprocess.run([sys.executable, 'simple_web.py'])
     except KeyboardInterrupt:
         print("\n👋 Monthly Pack Agent stopped. Thanks for using it!")
 
-def main():
+def main(production=False):
     print("🎁 Monthly Pack Agent - Starting...")
     print()
     
@@ -112,7 +116,10 @@ def main():
     print()
     
     # Start the server
-    start_server()
+    start_server(production)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Monthly Pack Agent - Simple Launcher')
+    parser.add_argument('--production', action='store_true',
+                       help='Serve with multiple gunicorn worker processes (serve.py) instead of the development server')
+    main(parser.parse_args().production)
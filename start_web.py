@@ -4,12 +4,13 @@ Monthly Pack Agent - Web Interface Launcher
 Quick launcher for the interactive web interface
 """
 
+import argparse
 import subprocess
 import webbrowser
 import time
 import os
 
-def start_web_interface():
+def start_web_interface(production=False):
     print("🚀 Starting Monthly Pack Web Interface...")
     
     # Check if we have recommendations
@@ -37,8 +38,14 @@ def start_web_interface():
     browser_thread.daemon = True
     browser_thread.start()
     
-    # Start the server
-    subprocess.run(['python', 'web_server.py'])
+    # Start the server: Flask's development server, or gunicorn workers in production mode
+    if production:
+        subprocess.run(['python', 'serve.py', '--app', 'web_server'])
+    else:
+        subprocess.run(['python', 'web_server.py'])
 
 if __name__ == "__main__":
-    start_web_interface()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Monthly Pack Agent - Web Interface Launcher')
+    parser.add_argument('--production', action='store_true',
+                       help='Serve with multiple gunicorn worker processes (serve.py) instead of the development server')
+    start_web_interface(parser.parse_args().production)
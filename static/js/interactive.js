@@ -0,0 +1,104 @@
+// Monthly Pack - refresh buttons on the interactive page
+
+// Card markup is rendered server-side; the API returns it as `html`
+function updateCategoryContent(category, html) {
+    const cardBody = document.querySelector(`[data-category="${category}"] .card-body`);
+    if (cardBody) {
+        cardBody.innerHTML = html;
+    }
+}
+
+function loadInto(category, url, button, loadingText, failureText) {
+    const originalText = button.textContent;
+    button.textContent = loadingText;
+    button.disabled = true;
+
+    fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                updateCategoryContent(category, data.html);
+            } else {
+                alert(failureText + ': ' + (data.error || 'Unknown error'));
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Error getting recommendations. Please try again.');
+        })
+        .finally(() => {
+            button.textContent = originalText;
+            button.disabled = false;
+        });
+}
+
+function refreshCategory(category) {
+    const button = document.querySelector(`[data-category="${category}"] .refresh-btn`);
+    loadInto(category, `/api/refresh/${category}`, button, '🔄 Loading...', 'Failed to get new recommendation');
+}
+
+function getMoreOptions(category) {
+    const button = document.querySelector(`[data-category="${category}"] .more-btn`);
+    loadInto(category, `/api/more/${category}`, button, '⏳ Loading...', 'Failed to get more options');
+}
+
+function refreshAllCategories() {
+    const button = document.querySelector('.refresh-all-btn');
+    const originalText = button.textContent;
+    button.textContent = '🔄 Refreshing All...';
+    button.disabled = true;
+
+    function finish() {
+        button.textContent = originalText;
+        button.disabled = false;
+    }
+
+    if (!window.EventSource) {
+        refreshAllAtOnce(finish);
+        return;
+    }
+
+    // Each card updates as soon as its provider answers
+    const source = new EventSource('/api/stream/refresh/all');
+    let failed = 0;
+    source.addEventListener('category', event => {
+        const data = JSON.parse(event.data);
+        if (data.success) {
+            updateCategoryContent(data.category, data.html);
+        } else {
+            failed += 1;
+        }
+    });
+    source.addEventListener('done', event => {
+        source.close();
+        finish();
+        if (failed || !JSON.parse(event.data).success) {
+            alert('Some recommendations could not be refreshed. Please try again.');
+        }
+    });
+    source.onerror = () => {
+        // Without this, EventSource would keep reconnecting and re-running the refresh
+        source.close();
+        finish();
+        alert('Error refreshing recommendations. Please try again.');
+    };
+}
+
+function refreshAllAtOnce(finish) {
+    fetch('/api/refresh/all')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                Object.keys(data.html).forEach(category => {
+                    updateCategoryContent(category, data.html[category]);
+                });
+            } else {
+                alert('Failed to refresh recommendations. Please try again.');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Error refreshing recommendations. Please try again.');
+        })
+        .finally(finish);
+}